@@ -1,28 +1,27 @@
 # https://adventofcode.com/2018/day/1
 
-from itertools import accumulate
+from functools import lru_cache
 import os.path
 
+import numpy as np
+
 STARTING_FREQUENCY = 0
 INPUT_FILE = 'input.txt'
 INPUT_TEST = 'input_test.txt'
 
 
-def list_forever(lst):
-    while True:
-        yield from lst
-
-
+@lru_cache(maxsize=None)
 def get_frequency_list(input_file):
-    with open(input_file) as f:
-        frequency_list = list(map(int, f))
+    frequency_list = np.loadtxt(input_file, dtype=np.int64, ndmin=1)
+    # parsed list is shared between both parts
+    frequency_list.flags.writeable = False
     return frequency_list
 
 
 # part 1
 def get_frequency(input_file):
     frequency_list = get_frequency_list(input_file)
-    return len(list(frequency_list)), sum(frequency_list)
+    return frequency_list.size, int(frequency_list.sum())
 
 
 def test_get_frequency():
@@ -34,18 +33,33 @@ def test_get_frequency():
 # part 2
 def get_repeat_frequency(input_file):
     frequency_list = get_frequency_list(input_file)
-    duplicate_found = None
-    found_frequencies = {STARTING_FREQUENCY}
-    candidates = list_forever(frequency_list)
+    # frequencies reached during the first pass, including the starting one
+    prefix = STARTING_FREQUENCY + np.concatenate(([0], np.cumsum(frequency_list)[:-1]))
+    total = int(frequency_list.sum())
 
-    for frequency in accumulate(candidates):
+    # duplicate already within the first pass, linear scan stops at the first hit
+    found_frequencies = set()
+    for frequency in prefix.tolist():
         if frequency in found_frequencies:
-            duplicate_found = frequency
-            break
-        else:
-            found_frequencies.add(frequency)
-
-    return duplicate_found
+            return frequency
+        found_frequencies.add(frequency)
+    if total == 0:
+        return STARTING_FREQUENCY
+
+    # in later passes frequency prefix[i] becomes prefix[i] + cycles * total,
+    # so it can only hit prefix[j] with the same remainder modulo total
+    values = prefix if total > 0 else -prefix
+    step = abs(total)
+    remainders = values % step
+    order = np.lexsort((values, remainders))
+    current, following = order[:-1], order[1:]
+    same_bucket = remainders[current] == remainders[following]
+    if not same_bucket.any():
+        return None
+    cycles = (values[following] - values[current]) // step
+    # index of the step at which the frequency is reached for the second time
+    steps = np.where(same_bucket, cycles * prefix.size + current, np.iinfo(np.int64).max)
+    return int(prefix[following[steps.argmin()]])
 
 
 def test_get_repeat_frequency():
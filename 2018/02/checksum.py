@@ -1,37 +1,47 @@
 # https://adventofcode.com/2018/day/2
 
-from collections import Counter
-from itertools import chain
+from functools import lru_cache
 import os.path
 
+import numpy as np
+
 INPUT_FILE = 'input.txt'
 INPUT_TEST = 'input_test.txt'
 INPUT_TEST2 = 'input_test2.txt'
+LETTER_COUNT = 26
 
 
+@lru_cache(maxsize=None)
 def get_id_list(input_file):
     with open(input_file) as f:
-        id_list = f.read().splitlines()
+        id_list = tuple(f.read().splitlines())
     return id_list
 
 
-def get_counts(word, number_of_duplicates):
+def get_id_matrix(id_list):
+    """
+    Gives ids of the same length as rows of ASCII codes
+    """
+    return np.frombuffer(''.join(id_list).encode(), dtype=np.uint8).reshape(len(id_list), -1)
+
+
+def get_letter_counts(id_matrix):
     """
-    Gives total number of duplicated letters within word
+    Gives tally of each lowercase letter within every id
     """
-    counts = Counter(chain.from_iterable(word))
-    duplicates = Counter(counts.values())
-    return duplicates[number_of_duplicates]
+    # offset letters of every row into its own block of the flat tally
+    rows = np.arange(id_matrix.shape[0])[:, np.newaxis]
+    flat_letters = (rows * LETTER_COUNT + id_matrix - ord('a')).ravel()
+    tally = np.bincount(flat_letters, minlength=id_matrix.shape[0] * LETTER_COUNT)
+    return tally.reshape(-1, LETTER_COUNT)
 
 
 # part 1
 def get_hash(input_file):
-    pairs = []
-    triplets = []
-    for box_id in get_id_list(input_file):
-        pairs.append(1 if get_counts(box_id, 2) > 0 else 0)
-        triplets.append(1 if get_counts(box_id, 3) > 0 else 0)
-    return sum(pairs) * sum(triplets)
+    letter_counts = get_letter_counts(get_id_matrix(get_id_list(input_file)))
+    pairs = np.any(letter_counts == 2, axis=1).sum()
+    triplets = np.any(letter_counts == 3, axis=1).sum()
+    return int(pairs) * int(triplets)
 
 
 def test_get_hash():
@@ -41,13 +51,15 @@ def test_get_hash():
 
 # part 2
 def get_common_letters(input_file):
-    id_list = sorted(get_id_list(input_file))
-
-    for pair in zip(id_list[:-1], id_list[1:]):
-        common_letters = ''.join([l1 for l1, l2 in zip(*pair) if l1 == l2])
-        if len(common_letters) == len(pair[0]) - 1:
-            return common_letters
-    return None
+    id_matrix = get_id_matrix(sorted(get_id_list(input_file)))
+
+    # count differing letters between every id and the following one
+    differences = (id_matrix[1:] != id_matrix[:-1]).sum(axis=1)
+    candidates = np.flatnonzero(differences == 1)
+    if not candidates.size:
+        return None
+    first, second = id_matrix[candidates[0]], id_matrix[candidates[0] + 1]
+    return first[first == second].tobytes().decode()
 
 
 def test_get_common_letters():
@@ -1,73 +1,46 @@
 # https://adventofcode.com/2018/day/3
 
 import re
-from collections import namedtuple
-from itertools import combinations
+from functools import lru_cache
 import os.path
 
+import numpy as np
+
 INPUT_FILE = 'input.txt'
 INPUT_TEST = 'input_test.txt'
-INPUT_REGEX = r'(?P<id>\d+) @ (?P<left>\d+),(?P<top>\d+): (?P<width>\d+)x(?P<height>\d+)'
-
-Claim = namedtuple('Claim', 'id left top right bottom')
-# inch is defined by its left top with width and height 1
-Inch = namedtuple('Inch', 'left top')
+INPUT_REGEX = re.compile(r'#(\d+) @ (\d+),(\d+): (\d+)x(\d+)')
 
 
+@lru_cache(maxsize=None)
 def parse_input(input_file):
-    # get list of all defined claims
-    parsed = set()
-    pattern = re.compile(INPUT_REGEX)
+    # get all defined claims as rows of id, left, top, right, bottom
     with open(input_file) as f:
-        for line in f:
-            result = pattern.search(line)
-            if result:
-                res_dict = result.groupdict()
-                claim = Claim(
-                    res_dict['id'],
-                    int(res_dict['left']),
-                    int(res_dict['top']),
-                    int(res_dict['left']) + int(res_dict['width']),
-                    int(res_dict['top']) + int(res_dict['height'])
-                )
-                parsed.add(claim)
-    return parsed
-
-
-def get_inches(claim):
-    # returns all individual square inches that are contained within given claim
-    inches = []
-    for x in range(claim.left, claim.right):
-        for y in range(claim.top, claim.bottom):
-            inches.append(Inch(x, y))
-    return inches
+        claims = np.array(INPUT_REGEX.findall(f.read()), dtype=np.int32).reshape(-1, 5)
+    # width and height are turned into right and bottom edge
+    claims[:, 3:] += claims[:, 1:3]
+    claims.flags.writeable = False
+    return claims
 
 
-def get_overlap(a, b):  # returns None if claims don't intersect
-    left_x = max(a.left, b.left)
-    right_x = min(a.right, b.right)
-    top_y = max(a.top, b.top)
-    bottom_y = min(a.bottom, b.bottom)
-
-    dx = right_x - left_x
-    dy = bottom_y - top_y
-
-    if (dx > 0) and (dy > 0):
-        return Claim('overlap', left_x, top_y, left_x + dx, top_y + dy)
+def get_fabric(claims):
+    # every square inch of fabric holds number of claims covering it
+    fabric = np.zeros((claims[:, 4].max(), claims[:, 3].max()), dtype=np.uint16)
+    for _, left, top, right, bottom in claims.tolist():
+        fabric[top:bottom, left:right] += 1
+    return fabric
 
 
 def get_all_inches(input_file):
-    overlap_inches = set()  # set of all individual inches from overlap claims
     claims = parse_input(input_file)
-    candidates = claims.copy()
-
-    for (a, b) in combinations(claims, 2):
-        overlap = get_overlap(a, b)
-        if overlap:
-            candidates.discard(a)
-            candidates.discard(b)
-            overlap_inches.update(get_inches(overlap))
-    return len(overlap_inches), candidates.pop().id
+    fabric = get_fabric(claims)
+
+    overlap_inches = int((fabric >= 2).sum())
+    # good claim is the only one covering its whole area alone
+    good_claim = next(
+        claim_id for claim_id, left, top, right, bottom in claims.tolist()
+        if fabric[top:bottom, left:right].max() == 1
+    )
+    return overlap_inches, str(good_claim)
 
 
 def test_get_all_inches():
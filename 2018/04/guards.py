@@ -1,34 +1,42 @@
 # https://adventofcode.com/2018/day/4
 
-import pandas as pd
+import re
 import os.path
 
+import numpy as np
+
 INPUT_FILE = 'input.txt'
 INPUT_TEST = 'input_test.txt'
+GUARD_REGEX = re.compile(r'Guard #(\d+) begins shift')
 
 
 def parse_input(input_file):
-    df = pd.read_csv(input_file, header=None, names=['text'])
-    # extract datetime and set as index
-    df.index = pd.to_datetime(df.text.str.replace('1518', '2018').str.extract(r'\[([^\]]+)\]')[0])
-    df = df.sort_index()
-    # extract guard id and forward fill to all their actions
-    df['guard_id'] = df.text.str.extract(r'Guard #(\d+) begins shift').ffill()
-    # extract when they were asleep
-    df['asleep'] = df.text.str.contains(r'falls asleep', na=False)
-    df = df[['guard_id', 'asleep']]
-    # resample to 1 minute
-    df = df.resample('1Min').ffill()
-    return df
+    """
+    Gives per guard count of how many times they were asleep in each minute of midnight hour
+    """
+    minutes = {}
+    guard_minutes = None
+    fell_asleep = None
+    with open(input_file) as f:
+        # timestamps are in ISO format so plain sort keeps them chronological
+        for line in sorted(f.read().splitlines()):
+            minute = int(line[15:17])  # line starts with [YYYY-MM-DD hh:mm]
+            if line.endswith('falls asleep'):
+                fell_asleep = minute
+            elif line.endswith('wakes up'):
+                guard_minutes[fell_asleep:minute] += 1
+            else:
+                guard_id = int(GUARD_REGEX.search(line).group(1))
+                guard_minutes = minutes.setdefault(guard_id, np.zeros(60, dtype=np.int32))
+    return minutes
 
 
 def get_most_sleep_guard(input_file):
     records = parse_input(input_file)
     # calculate total time spent sleeping per guard and get guard id of max value
-    guard = records.groupby('guard_id').sum()['asleep'].idxmax()
-    records_filtered = records[records.guard_id == guard]
-    # filter actions just for that guard and get top minute spend sleeping
-    minute = records_filtered.groupby(records_filtered.index.minute).sum()['asleep'].idxmax()
+    guard = max(records, key=lambda guard_id: records[guard_id].sum())
+    # get top minute spent sleeping by that guard
+    minute = records[guard].argmax()
 
     return int(guard), int(minute)
 
@@ -42,7 +50,8 @@ def test_get_most_sleep_guard():
 def get_guard_per_minutes(input_file):
     records = parse_input(input_file)
     # get max of which minutes was each guard typically asleep
-    guard, minute = records.groupby(['guard_id', records.index.minute]).sum().idxmax().tolist()[0]
+    guard = max(records, key=lambda guard_id: records[guard_id].max())
+    minute = records[guard].argmax()
 
     return int(guard), int(minute)
 
@@ -9,36 +9,31 @@ INPUT_TEST = 'input_test.txt'
 
 def get_input(input_file):
     with open(input_file, "rb") as f:
-        while True:
-            # no need to read chunks as python already buffers input
-            byte = f.read(1)
-            if not byte:
-                break
-            yield ord(byte)
+        return f.read().strip()
 
 
-def is_react(a: int, b: int):
-    return abs(a - b) == 32
+def reduce_polymer(polymer: bytes):
+    # reacted polymers work as a stack, each unit either cancels the top or is pushed on it
+    # ASCII upper and lower case letters differ only in bit 5 (value 32)
+    stack = bytearray()
+    for b in polymer:
+        if stack and stack[-1] ^ b == 32:
+            stack.pop()
+        else:
+            stack.append(b)
+    return stack
+
+
+def filter_polymer(polymer: bytes | bytearray, filter_char: int):
+    # filter out unwanted polymers of both cases
+    return polymer.translate(None, delete=bytes([filter_char, filter_char + 32]))
 
 
 def react(input_file, filter_char=None):
-    # initialise polymers by having starting item that is not going to react
-    polymers = bytearray([255])
+    polymer = get_input(input_file)
     if filter_char:
-        iterator = filter(lambda x: x != filter_char and x != filter_char + 32, get_input(input_file))
-    else:
-        iterator = get_input(input_file)
-    try:
-        for b in iterator:
-            # filter out unwanted polymers
-            while is_react(polymers[-1], b):
-                polymers.pop()
-                b = next(iterator)
-            polymers.append(b)
-    except StopIteration:
-        pass
-    # skip dummy item
-    return polymers[1:]
+        polymer = filter_polymer(polymer, filter_char)
+    return reduce_polymer(polymer)
 
 
 def test_react():
@@ -47,10 +42,13 @@ def test_react():
 
 
 def optimize_react(input_file):
+    # units that react anyway would react also with other unit type removed,
+    # so every candidate can start from already reduced polymer instead of the whole input
+    polymer = reduce_polymer(get_input(input_file))
     results = {}
     # iterate over all letters and try removing them
     for filter_char in range(65, 91):
-        results[filter_char] = len(react(input_file, filter_char))
+        results[filter_char] = len(reduce_polymer(filter_polymer(polymer, filter_char)))
 
     return min(results.items(), key=itemgetter(1))
 
@@ -1,33 +1,32 @@
 # https://adventofcode.com/2021/day/1
 
-import itertools
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable
+
+import numpy as np
 
 INPUT_FILE = 'input.txt'
 INPUT_TEST = 'input_test.txt'
 
 HERE = Path(__file__).parent.resolve()
+WINDOW_SIZE = 3
 
 
-def is_greater_pairwise(iterable: Iterable) -> list[bool]:
-    itr_a, itr_b = itertools.tee(iterable)
-    next(itr_b, None)
-    return [y > x for (x, y) in zip(itr_a, itr_b)]
-
+def is_greater_pairwise(measurements: np.ndarray) -> np.ndarray:
+    return measurements[1:] > measurements[:-1]
 
-def is_greater_window(iterable: Iterable) -> list[bool]:
-    itr_a, itr_b, itr_c = itertools.tee(iterable, 3)
-    next(itr_b, None)
-    next(itr_c, None)
-    next(itr_c, None)
 
-    sums = [sum(x) for x in zip(itr_a, itr_b, itr_c)]
-    return is_greater_pairwise(sums)
+def is_greater_window(measurements: np.ndarray) -> np.ndarray:
+    # neighbouring windows share all but their outer measurements, so only those need comparing
+    return measurements[WINDOW_SIZE:] > measurements[:-WINDOW_SIZE]
 
 
-def get_measurement_list(input_file: Path) -> list[int]:
-    return [int(x) for x in input_file.read_text().split("\n")]
+@lru_cache(maxsize=None)
+def get_measurement_list(input_file: Path) -> np.ndarray:
+    measurements = np.loadtxt(input_file, dtype=np.int64, ndmin=1)
+    # parsed measurements are shared between both parts
+    measurements.flags.writeable = False
+    return measurements
 
 
 # part 1
@@ -35,7 +34,7 @@ def count_increased_depth(input_file: Path) -> int:
     measurements = get_measurement_list(input_file)
     truth_list = is_greater_pairwise(measurements)
 
-    return sum(truth_list)
+    return int(truth_list.sum())
 
 
 def test_count_increased_depth():
@@ -48,7 +47,7 @@ def count_increased_window_depth(input_file: Path) -> int:
     measurements = get_measurement_list(input_file)
     truth_list = is_greater_window(measurements)
 
-    return sum(truth_list)
+    return int(truth_list.sum())
 
 
 def test_count_increased_window_depth():
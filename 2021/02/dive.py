@@ -2,28 +2,35 @@
 
 import os
 
+import numpy as np
+
 INPUT_FILE = 'input.txt'
 INPUT_TEST = 'input_test.txt'
 
+# sign vectors of horizontal and vertical change for every move
+MOVES = {
+    'forward': (1, 0),
+    'up': (0, -1),
+    'down': (0, 1),
+}
 
-# part 1
-def calculate_position(input_file: str) -> (int, int):
-    position = 0
-    depth = 0
 
+def parse_lines(input_file: str) -> (np.ndarray, np.ndarray):
+    """ Gives horizontal and vertical change for each line. """
     with open(input_file) as f:
-        for line in f:
-            move, num = line.strip().split(maxsplit=1)
+        words = f.read().split()
+    try:
+        signs = np.array([MOVES[move] for move in words[0::2]], dtype=np.int64).reshape(-1, 2)
+    except KeyError as e:
+        raise ValueError(f'Could not parse move: {e.args[0]}') from e
+    changes = signs * np.array(words[1::2], dtype=np.int64)[:, np.newaxis]
+    return changes[:, 0], changes[:, 1]
+
 
-            if move == 'forward':
-                position += int(num)
-            elif move == 'up':
-                depth -= int(num)
-            elif move == 'down':
-                depth += int(num)
-            else:
-                raise ValueError(f'Could not parse line: {line}')
-    return position, depth
+# part 1
+def calculate_position(input_file: str) -> (int, int):
+    forward, vertical = parse_lines(input_file)
+    return int(forward.sum()), int(vertical.sum())
 
 
 def test_calculate_position():
@@ -35,25 +42,10 @@ def test_calculate_position():
 # part 2
 
 def calculate_position2(input_file: str) -> (int, int):
-    position = 0
-    depth = 0
-    aim = 0
-
-    with open(input_file) as f:
-        for line in f:
-            move, num = line.strip().split(maxsplit=1)
-
-            if move == 'forward':
-                position += int(num)
-                depth += int(num) * aim
-            elif move == 'up':
-                aim -= int(num)
-            elif move == 'down':
-                aim += int(num)
-            else:
-                raise ValueError(f'Could not parse line: {line}')
-
-    return position, depth
+    forward, vertical = parse_lines(input_file)
+    # vertical changes only turn the submarine, its depth changes when moving forward
+    aim = np.cumsum(vertical)
+    return int(forward.sum()), int((forward * aim).sum())
 
 
 def test_calculate_position2():
@@ -1,39 +1,40 @@
 # https://adventofcode.com/2021/day/3
 
 import os
-import pandas as pd
+from functools import lru_cache
+
+import numpy as np
 
 INPUT_FILE = 'input.txt'
 INPUT_TEST = 'input_test.txt'
 
 FIRST_ROW = 0
-LAST_ROW = -1
 
 
-def parse_lines(input_file: str) -> list[list[int]]:
-    parsed_lines = []
+@lru_cache(maxsize=None)
+def parse_lines(input_file: str) -> np.ndarray:
     with open(input_file) as f:
-        for line in f:
-            parsed_lines.append([int(number) for number in line.rstrip()])
-    return parsed_lines
+        lines = f.read().split()
+    # one row of bits per line
+    parsed = np.frombuffer(''.join(lines).encode(), dtype=np.uint8).reshape(len(lines), -1) - ord('0')
+    # parsed report is shared between both parts
+    parsed.flags.writeable = False
+    return parsed
 
 
-def to_int(binary_list: list[int]) -> int:
-    return int(''.join(str(x) for x in binary_list), 2)
+def to_int(bits: np.ndarray) -> int:
+    # dot product with powers of two, most significant bit first
+    return int(bits @ (1 << np.arange(bits.size - 1, -1, -1, dtype=np.int64)))
 
 
 # part 1
 def get_rates(input_file: str) -> (int, int):
     parsed = parse_lines(input_file)
 
-    # old solution without pandas
-    # transposed = [list(line) for line in zip(*parsed)]
-    # gamma_list = [1 if sum(trans_line) > len(trans_line) / 2 else 0 for trans_line in transposed]
-
-    # get most common values for all columns
-    gamma_list = pd.DataFrame(parsed).mode().values[FIRST_ROW].tolist()
+    # get most common values for all columns, ones have to be more than half of rows
+    gamma_list = (parsed.sum(axis=0) * 2 > parsed.shape[0]).astype(np.int64)
     # reverse list for least common values
-    epsilon_list = [1 - x for x in gamma_list]
+    epsilon_list = 1 - gamma_list
 
     return to_int(gamma_list), to_int(epsilon_list)
 
@@ -46,41 +47,33 @@ def test_get_rates():
 
 # part 2
 
-def filter_in_col(df: pd.DataFrame, col: int) -> (pd.DataFrame, pd.DataFrame):
+def filter_in_col(rows: np.ndarray, col: int) -> (np.ndarray, np.ndarray):
     """ Will filter rows with the most/least common number in specified column"""
 
-    if df.shape[0] == 1:
-        # we are done with one row left
-        return df, df
-
-    # detect if both numbers are equally common
-    is_equally_common = bool(df[col].value_counts().min() == df[col].value_counts().max())
-
-    most_common_number = df[col].value_counts().index[FIRST_ROW]
+    ones = int(rows[:, col].sum())
+    if rows.shape[0] == 1 or ones in (0, rows.shape[0]):
+        # we are done with one row left or there is nothing to filter by
+        return rows, rows
 
-    if is_equally_common:
-        filtered_value = 1
-    else:
-        filtered_value = int(most_common_number)
+    # ones win when both numbers are equally common
+    filtered_value = 1 if ones * 2 >= rows.shape[0] else 0
 
-    result_df = df.loc[df[col] == filtered_value]
-    other_df = df.loc[df[col] != filtered_value]
-    return result_df, other_df
+    is_filtered = rows[:, col] == filtered_value
+    return rows[is_filtered], rows[~is_filtered]
 
 
 def get_life_support_rating(input_file: str) -> (int, int):
     parsed = parse_lines(input_file)
 
-    parsed_df = pd.DataFrame(parsed)
-    oxygen_df = parsed_df.copy()
-    co2_df = parsed_df.copy()
+    oxygen_rows = parsed
+    co2_rows = parsed
 
-    for col in range(parsed_df.shape[1]):
-        oxygen_df, _ = filter_in_col(oxygen_df, col)
-        _, co2_df = filter_in_col(co2_df, col)
+    for col in range(parsed.shape[1]):
+        oxygen_rows, _ = filter_in_col(oxygen_rows, col)
+        _, co2_rows = filter_in_col(co2_rows, col)
 
-    oxygen_rate = to_int(oxygen_df.values[0].tolist())
-    co2_rate = to_int(co2_df.values[0].tolist())
+    oxygen_rate = to_int(oxygen_rows[FIRST_ROW])
+    co2_rate = to_int(co2_rows[FIRST_ROW])
 
     return oxygen_rate, co2_rate
 
@@ -1,77 +1,76 @@
 # https://adventofcode.com/2021/day/4
 
 import os
-import itertools
 import logging
 
+from functools import lru_cache
 from typing import Optional
 from dataclasses import dataclass, field
 
+import numpy as np
+
 INPUT_FILE = 'input.txt'
 INPUT_TEST = 'input_test.txt'
 
-
-def chunks(lst, n):
-    """Yield successive n-sized chunks from lst."""
-    for i in range(0, len(lst), n):
-        yield lst[i:i + n]
+BOARD_SIZE = 5
 
 
 @dataclass
 class Bingo:
-    """ Class for keeping track of Bingo boards """
-    rows: list[list[int]]
-    cols: list[list[int]] = field(init=False)
-    id: int = field(default_factory=itertools.count().__next__, init=False)
+    """ Class for keeping track of all Bingo boards at once """
+    boards: np.ndarray  # numbers of all boards stacked in shape (count, 5, 5)
+    marked: np.ndarray = field(init=False)  # which numbers of boards were already struck
 
     def __post_init__(self):
-        if len(self.rows) != 5:
-            raise ValueError(f'Incorrect number of rows: {len(self.rows)} is not 5')
-        self.cols = [list(col) for col in zip(*self.rows)]
-        # self.cols = [[row[i] for row in self.rows] for i in range(5)]
-
-    def total_sum(self) -> int:
-        """ Returns total sum of all remaining numbers in bingo board. """
-        return sum(itertools.chain.from_iterable(self.rows))
-
-    def strike_number(self, number) -> Optional[int]:
-        """ Will strike the number from bingo board. """
-        for line in itertools.chain(self.rows, self.cols):
-            while number in line:
-                line.remove(number)
-            if not line:  # list is empty
-                logging.debug(f'BINGO! After removing {number}, there is an empty line!\n'
-                              f'Total count of remaining numbers is {self.total_sum()}.')
-                return self.total_sum() * number
-        return None
-
-
-def parse_lines(input_file) -> (list[int], list[Bingo]):
-    all_rows = []
-    boards = []
+        if self.boards.shape[1:] != (BOARD_SIZE, BOARD_SIZE):
+            raise ValueError(f'Incorrect shape of boards: {self.boards.shape[1:]} is not 5x5')
+        self.marked = np.zeros_like(self.boards, dtype=bool)
 
-    with open(input_file) as f:
-        numbers = [int(x) for x in f.readline().strip().split(sep=',')]
+    def __len__(self) -> int:
+        return self.boards.shape[0]
+
+    def score(self, board: int, number: int) -> int:
+        """ Returns total sum of all remaining numbers in bingo board multiplied by last number. """
+        return int(self.boards[board][~self.marked[board]].sum()) * number
+
+    def strike_number(self, number: int) -> np.ndarray:
+        """ Will strike the number from all bingo boards and return indexes of boards with full line. """
+        self.marked |= self.boards == number
+        has_full_col = self.marked.all(axis=1).any(axis=1)
+        has_full_row = self.marked.all(axis=2).any(axis=1)
+        return np.flatnonzero(has_full_col | has_full_row)
 
-        for line in f:
-            line = line.strip()
-            if line:
-                all_rows.append([int(x) for x in line.split()])
+    def remove(self, boards: np.ndarray) -> None:
+        """ Will remove boards at given indexes from the game. """
+        self.boards = np.delete(self.boards, boards, axis=0)
+        self.marked = np.delete(self.marked, boards, axis=0)
 
-    for rows in chunks(all_rows, 5):
-        boards.append(Bingo(rows))
 
+@lru_cache(maxsize=None)
+def read_lines(input_file) -> (tuple[int, ...], np.ndarray):
+    with open(input_file) as f:
+        numbers = tuple(int(x) for x in f.readline().strip().split(sep=','))
+        # empty lines between boards are skipped by loadtxt
+        boards = np.loadtxt(f, dtype=np.int16).reshape(-1, BOARD_SIZE, BOARD_SIZE)
+
+    # parsed boards are shared between both parts, every game only gets its own marks
+    boards.flags.writeable = False
     return numbers, boards
 
 
+def parse_lines(input_file) -> (list[int], Bingo):
+    numbers, boards = read_lines(input_file)
+    return list(numbers), Bingo(boards)
+
+
 # part 1
 def calculate_bingo(input_file) -> Optional[int]:
-    numbers, boards = parse_lines(input_file)
+    numbers, bingo = parse_lines(input_file)
     for number in numbers:
-        for board in boards:
-            score = board.strike_number(number)
-            if score is not None:
-                return score
+        winners = bingo.strike_number(number)
+        if winners.size:
+            logging.debug(f'BINGO! After removing {number}, board {winners[0]} has an empty line!')
+            return bingo.score(winners[0], number)
     return None
 
 
@@ -82,20 +81,15 @@ def test_calculate_bingo():
 
 # part 2
 def calculate_last_winning_bingo(input_file) -> Optional[int]:
-    numbers, boards = parse_lines(input_file)
+    numbers, bingo = parse_lines(input_file)
 
     for number in numbers:
         logging.debug(f'\nStriking number {number}.')
-        score = None
-        for i, board in enumerate(boards[:]):
-            logging.debug(f'\tRunning board {board.id}.')
-            score = board.strike_number(number)
-            logging.debug(f'\t\tRows: {board.rows}\n\t\tCols: {board.cols}.')
-            if score is not None:
-                boards.pop(i)
-                logging.debug(f'Board {board.id} has won with score {score} and will be skipped.')
-        if not boards:
-            return score
+        winners = bingo.strike_number(number)
+        if winners.size == len(bingo):
+            return bingo.score(winners[-1], number)
+        logging.debug(f'Boards {winners.tolist()} have won and will be skipped.')
+        bingo.remove(winners)
     return None
 
 
@@ -3,69 +3,47 @@
 from __future__ import annotations
 
 import sys
-from dataclasses import dataclass
-from collections import Counter, namedtuple
+import re
+from functools import lru_cache
 
 import os
-import itertools
 import logging
 
+import numpy as np
+
 INPUT_FILE = 'input.txt'
 INPUT_TEST = 'input_test.txt'
 
-Point = namedtuple('Point', ['x', 'y'])
-
-
-def parse_point(point_str: str) -> Point:
-    x, y = point_str.split(sep=',')
-    return Point(int(x), int(y))
-
-
-@dataclass
-class Line:
-    a: Point
-    b: Point
+NUMBER_REGEX = re.compile(r'\d+')
 
-    def get_points(self) -> list[Point]:
-        """ Calculate all points that line goes through """
-        incr_x = 1 if self.a.x <= self.b.x else -1
-        incr_y = 1 if self.a.y <= self.b.y else -1
 
-        x_coords = list(range(self.a.x, self.b.x + incr_x, incr_x))
-        y_coords = list(range(self.a.y, self.b.y + incr_y, incr_y))
+def get_points(lines: np.ndarray) -> (np.ndarray, np.ndarray):
+    """ Calculate x and y coordinates of all points that given lines go through """
+    starts, ends = lines[:, :2], lines[:, 2:]
+    steps = np.sign(ends - starts)
+    # lines are only vertical, horizontal or diagonal, so both coordinates change by at most 1 per point
+    lengths = np.abs(ends - starts).max(axis=1) + 1
+    # for every point get index of its line and its distance from start of that line
+    line_idx = np.repeat(np.arange(lines.shape[0]), lengths)
+    distances = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    points = starts[line_idx] + distances[:, np.newaxis] * steps[line_idx]
 
-        if self.is_vertical():
-            fill = self.a.x
-        elif self.is_horizontal():
-            fill = self.a.y
-        else:  # line is diagonal -> fill is not needed
-            fill = None
+    return points[:, 0], points[:, 1]
 
-        # create points from x,y coordinates
-        # for non-diagonal lines the coords are not of same length and the shorter list must be filled
-        all_points = [Point(x, y) for x, y in itertools.zip_longest(x_coords, y_coords, fillvalue=fill)]
 
-        return all_points
+def is_straight(lines: np.ndarray) -> np.ndarray:
+    """ Mask of lines that are vertical or horizontal """
+    return (lines[:, 0] == lines[:, 2]) | (lines[:, 1] == lines[:, 3])
 
-    def is_vertical(self) -> bool:
-        return self.a.x == self.b.x
 
-    def is_horizontal(self) -> bool:
-        return self.a.y == self.b.y
-
-    def is_intersect(self, line: Line) -> set[Point]:
-        """ Get set of all intersecting points """
-        return set(self.get_points()) & set(line.get_points())
-
-
-def parse_lines(input_file) -> list[Line]:
-    # 0,9 -> 5,9  ... [(0,9),(5,9)]
-    lines = []
+@lru_cache(maxsize=None)
+def parse_lines(input_file) -> np.ndarray:
+    # 0,9 -> 5,9  ... [0, 9, 5, 9]
     with open(input_file) as f:
-        for row in f:
-            a, b = row.strip().split(sep=' -> ')
-            line = Line(parse_point(a), parse_point(b))
-            lines.append(line)
+        numbers = NUMBER_REGEX.findall(f.read())
+    lines = np.array(numbers, dtype=np.int64).reshape(-1, 4)
+    # parsed lines are shared between both parts
+    lines.flags.writeable = False
     return lines
 
 
@@ -75,14 +53,14 @@ def count_intersections(input_file: str, use_diagonal: bool = False) -> int:
     lines = parse_lines(input_file)
     # filter out diagonal lines if needed
     if not use_diagonal:
-        lines = [line for line in lines if line.is_vertical() or line.is_horizontal()]
-
-    all_points = [line.get_points() for line in lines]
+        lines = lines[is_straight(lines)]
 
-    # count all points generated from lines
-    counter = Counter(itertools.chain.from_iterable(all_points))
+    # count how many lines go through every point of the grid
+    x_coords, y_coords = get_points(lines)
+    width = int(x_coords.max(initial=0)) + 1
+    grid = np.bincount(y_coords * width + x_coords)
     # if any point is generated more than once, it is intersection
-    return sum(value > 1 for value in counter.values())
+    return int(np.count_nonzero(grid >= 2))
 
 
 def test_count_intersections():
@@ -1,7 +1,9 @@
 # https://adventofcode.com/2021/day/6
 
+from __future__ import annotations
+
 from dataclasses import dataclass
-from collections import Counter
+from functools import lru_cache
 from timeit import default_timer as timer
 
 import sys
@@ -16,54 +18,56 @@ NEWBORN_CD = 8  # reproduction countdown for newly born fish
 RESET_CD = 6  # reproduction countdown for fish that just created offspring
 
 
+def get_day_transition() -> np.ndarray:
+    """ Linear map of countdown counts from one day to the next. """
+    # python ints do not overflow, int64 counts of a few hundred fish overflow after roughly 430 days
+    transition = np.zeros((NEWBORN_CD + 1, NEWBORN_CD + 1), dtype=object)
+    # for all the fish subtract one day from their countdown
+    for countdown in range(1, NEWBORN_CD + 1):
+        transition[countdown - 1, countdown] = 1
+    # fish with zero countdown reset and create newborn fish
+    transition[RESET_CD, 0] = 1
+    transition[NEWBORN_CD, 0] = 1
+    return transition
+
+
+DAY_TRANSITION = get_day_transition()
+
+
 @dataclass
 class FishPopulation:
     """ This represents all the lantern-fish in the ocean """
-    countdown_counter: Counter  # counter of all the fish using their reproduction countdown as key
+    counts: np.ndarray  # number of fish (python ints) for every reproduction countdown used as index
 
-    def size(self):
+    @classmethod
+    def from_countdowns(cls, countdowns: np.ndarray) -> FishPopulation:
+        """ Create population from reproduction countdowns of individual fish. """
+        return cls(np.bincount(countdowns, minlength=NEWBORN_CD + 1).astype(object))
+
+    def size(self) -> int:
         """ Size of current fish population. """
-        return sum(self.countdown_counter.values())
-
-    def cd_subtract(self):
-        """ Simulates one day passing and how it affects the fish. """
-        new_cd_counter = Counter()
-        # for all the fish subtract one day from their countdown
-        for key, val in self.countdown_counter.items():
-            new_cd_counter[key - 1] = val
-        # negative countdown means those fish are currently reproducing
-        reproducing = new_cd_counter.get(-1)
-        if reproducing:
-            # create newborn fish
-            new_cd_counter[NEWBORN_CD] += reproducing
-            # reset fish
-            new_cd_counter[RESET_CD] += reproducing
-            del new_cd_counter[-1]
-        self.countdown_counter = new_cd_counter
+        return int(self.counts.sum())
 
     def advance(self, days: int) -> None:
         """ Advance population by number of days given. """
-        for _ in range(days):
-            self.cd_subtract()
+        # days are applied at once as power of the one day transition
+        self.counts = np.linalg.matrix_power(DAY_TRANSITION, days) @ self.counts
 
 
-def parse_lines(input_file) -> list[int]:
-    with open(input_file) as f:
-        parsed = [int(x) for x in f.readline().strip().split(',')]
-    return parsed
+@lru_cache(maxsize=None)
+def parse_lines(input_file) -> np.ndarray:
+    countdowns = np.loadtxt(input_file, dtype=np.int64, delimiter=',', ndmin=1)
+    # parsed countdowns are shared between both parts
+    countdowns.flags.writeable = False
+    return countdowns
 
 
 # part 1
 def simulate_fish(input_file: str, days: int) -> int:
-    fish = parse_lines(input_file)
-    arr = np.array(fish)
-    while days > 0:
-        new = np.repeat(NEWBORN_CD, np.count_nonzero(arr == 0))
-        arr = arr - 1
-        arr[arr < 0] = RESET_CD
-        arr = np.append(arr, new)
-        days -= 1
-    return arr.size
+    fish = FishPopulation.from_countdowns(parse_lines(input_file))
+    fish.advance(days)
+
+    return fish.size()
 
 
 def test_simulate_fish():
@@ -74,8 +78,7 @@ def test_simulate_fish():
 # part 2
 
 def simulate_hella_lot_fish(input_file: str, days: int) -> int:
-    parsed = parse_lines(input_file)
-    fish = FishPopulation(Counter(parsed))
+    fish = FishPopulation.from_countdowns(parse_lines(input_file))
     fish.advance(days)
 
     return fish.size()
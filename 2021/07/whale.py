@@ -2,30 +2,30 @@
 
 from timeit import default_timer as timer
 from statistics import median
+from functools import lru_cache
 
 import sys
 import os
 import logging
 
+import numpy as np
+
 INPUT_FILE = 'input.txt'
 INPUT_TEST = 'input_test.txt'
 
 
-def parse_lines(input_file) -> list[int]:
-    with open(input_file) as f:
-        parsed = [int(x) for x in f.readline().strip().split(',')]
-    return parsed
+@lru_cache(maxsize=None)
+def parse_lines(input_file) -> np.ndarray:
+    positions = np.loadtxt(input_file, dtype=np.int64, delimiter=',', ndmin=1)
+    # parsed positions are shared between both parts
+    positions.flags.writeable = False
+    return positions
 
 
 def get_simple_distance(a: int, b: int) -> int:
     return abs(a - b)
 
 
-def get_distance(a: int, b: int) -> int:
-    distance = get_simple_distance(a, b)
-    return (distance * (distance + 1)) // 2
-
-
 # part 1
 def align_crabs(input_file: str) -> (int, int):
     positions = parse_lines(input_file)
@@ -43,16 +43,15 @@ def test_align_crabs():
 
 # part 2
 def align_crabs2(input_file: str) -> (int, int):
-    positions = sorted(parse_lines(input_file))
-    distances = []
+    positions = parse_lines(input_file)
+    candidates = np.arange(positions.min(), positions.max() + 1)
 
-    for candidate in range(positions[0], positions[-1]):
-        distances.append(sum([get_distance(candidate, pos) for pos in positions]))
-    # min_dis = math.floor(mean(positions))
-    min_dis = min(distances)
-    best_pos = distances.index(min_dis)
+    # fuel spent by every crab for every candidate position grows as triangular number of distance
+    distances = np.abs(candidates[:, np.newaxis] - positions[np.newaxis, :])
+    fuel = (distances * (distances + 1) // 2).sum(axis=1)
+    best = fuel.argmin()
 
-    return best_pos, min_dis
+    return int(candidates[best]), int(fuel[best])
 
 
 def test_align_crabs2():
@@ -16,72 +16,43 @@ UQ_SEGMENTS = {
     7: 8
 }
 
-SEGMENTS = [
-    (1, 1, 1, 0, 1, 1, 1),  # 0 - 6
-    (0, 0, 1, 0, 0, 1, 0),  # 1 - 2
-    (1, 0, 1, 1, 1, 0, 1),  # 2 - 5
-    (1, 0, 1, 1, 0, 1, 1),  # 3 - 5
-    (0, 1, 1, 1, 0, 1, 0),  # 4 - 4
-    (1, 1, 0, 1, 0, 1, 1),  # 5 - 5
-    (1, 1, 0, 1, 1, 1, 1),  # 6 - 6
-    (1, 0, 1, 0, 0, 1, 0),  # 7 - 3
-    (1, 1, 1, 1, 1, 1, 1),  # 8 - 7
-    (1, 1, 1, 1, 0, 1, 1),  # 9 - 6
-]
+# number of set bits for every 7-bit wires pattern
+POPCOUNT = [bin(i).count('1') for i in range(1 << 7)]
 
 
 class Display:
-    """ Represents 7-bit display. """
-    bits: list[set[str]]  # bits contain all possible wires connected to each big
-
-    def __init__(self):
-        """ Initiate with all bits set to all possible wires """
-        self.wiring = None
-        self.bits = []
-        for _ in range(7):
-            self.bits.append(set('abcdefg'))
-
-    def specify(self, bit: int, wire: str):
-        """ For specific bit set exactly one wire connected to it and remove it from other bits. """
-        assert len(wire) == 1, "Wire must be one letter."
-        for options in self.bits:
-            options.discard(wire)
-        self.bits[bit] = {wire}
-
-    def set_for_number(self, number_def: tuple[int, ...], wires: set[str]):
-        """ Based on number bit definition set display bits from given wires """
-        for bit_idx, bit_is_set in enumerate(number_def):
-            option = self.bits[bit_idx]
-            if not bit_is_set:
-                # for disabled bits remove given wires
-                option -= wires
-            else:
-                # for enabled bits add intersection of existing and given wires
-                option &= wires
-
-    def is_unambiguous(self) -> bool:
-        """ Display is solved, we have exactly 1 wire for each bit """
-        solved = all(len(options) == 1 for options in self.bits)
-        if solved:
-            self.wiring = [next(iter(options)) for options in self.bits]
-        return solved
-
-    def identify_digit(self, wires: set[str]) -> int:
-        """ From given wires identify number from display bits and number definition. """
-        assert self.is_unambiguous(), 'Cannot identify until we solve all bits from input.'
-
-        digit_by_letters = tuple(
-            1 if wire in wires else 0
-            for wire in self.wiring
-        )
-        return SEGMENTS.index(digit_by_letters)  # type: ignore
-
-
-def parse_wires(input_str: str) -> list[set[str]]:
-    return [set(item) for item in input_str.strip().split()]
-
-
-def parse_lines(input_file) -> list[tuple[list[set[str]], list[set[str]]]]:
+    """ Represents 7-bit display. Wire patterns are bitmasks with bit 0 for wire 'a' up to bit 6 for wire 'g'. """
+    one: int  # wires of digit one
+    four: int  # wires of digit four
+
+    def __init__(self, inputs: list[int]):
+        """ Find wires of digits one and four that have unique number of segments. """
+        self.one = next(wires for wires in inputs if POPCOUNT[wires] == 2)
+        self.four = next(wires for wires in inputs if POPCOUNT[wires] == 4)
+
+    def identify_digit(self, wires: int) -> int:
+        """ From given wires identify number by number of segments and overlap with one and four. """
+        count = POPCOUNT[wires]
+        if count in UQ_SEGMENTS:
+            return UQ_SEGMENTS[count]
+        # segments of four that are not in one (left top and middle)
+        four_corner = self.four & ~self.one
+        if count == 6:
+            if wires & self.one != self.one:
+                return 6
+            return 9 if wires & self.four == self.four else 0
+        if count == 5:
+            if wires & self.one == self.one:
+                return 3
+            return 5 if wires & four_corner == four_corner else 2
+        raise ValueError(f'Cannot identify digit from wires {wires:07b}.')
+
+
+def parse_wires(input_str: str) -> list[int]:
+    return [sum(1 << (ord(wire) - ord('a')) for wire in item) for item in input_str.strip().split()]
+
+
+def parse_lines(input_file) -> list[tuple[list[int], list[int]]]:
     lines = []
     with open(input_file) as f:
         for line in f:
@@ -95,38 +66,14 @@ def count_unique_segments(input_file: str) -> int:
     lines = parse_lines(input_file)
     counter = 0
     for _, outputs in lines:
-        counter += len([len(d) for d in outputs if len(d) in UQ_SEGMENTS])
+        counter += sum(1 for d in outputs if POPCOUNT[d] in UQ_SEGMENTS)
 
     return counter
 
 
-def resolve(line: tuple[list[set[str]], list[set[str]]]) -> int:
+def resolve(line: tuple[list[int], list[int]]) -> int:
     inputs, outputs = line
-    display = Display()
-    inputs.sort(key=len)
-
-    display.set_for_number(SEGMENTS[1], inputs[0])
-    display.set_for_number(SEGMENTS[7], inputs[1])
-    display.set_for_number(SEGMENTS[4], inputs[2])
-    display.set_for_number(SEGMENTS[8], inputs[-1])
-
-    seven = inputs[1]
-    fives = [i for i in inputs if len(i) == 5]
-    for candidate in fives:
-        if seven <= candidate:
-            # three is only 5-letter long candidate that contains seven's bits
-            display.set_for_number(SEGMENTS[3], candidate)
-
-    almost_two = set()
-    for bit in (0, 3, 4, 6):  # all bits but second for number two
-        almost_two |= display.bits[bit]
-
-    for candidate in fives:
-        if almost_two <= candidate:
-            remaining_wires = candidate - almost_two  # get missing wire for 2nd bit
-            assert len(remaining_wires) == 1
-            remaining_wire = remaining_wires.pop()
-            display.specify(bit=2, wire=remaining_wire)
+    display = Display(inputs)
 
     number = 0
     for output in outputs:
@@ -1,120 +1,99 @@
 # https://adventofcode.com/2021/day/9
 
 from timeit import default_timer as timer
-from dataclasses import dataclass, field
-from collections import namedtuple, defaultdict
-from typing import Optional
+from dataclasses import dataclass
+from functools import lru_cache
 
 import sys
 import os
 import logging
 
+import numpy as np
+
 INPUT_FILE = 'input.txt'
 INPUT_TEST = 'input_test.txt'
 
-Point = namedtuple('Point', 'x y')
-
 MAX_LVL = 9
 
 
 @dataclass(frozen=False)
 class Cave:
-    _levels: list[list[int]]
-    basins: defaultdict[Point, set[Point]] = field(init=False)
-
-    def __post_init__(self):
-        self.basins = defaultdict(set)
+    _levels: np.ndarray
 
     def shape(self) -> tuple[int, int]:
         """ Shape of cave X x Y """
-        return len(self._levels[0]), len(self._levels)
-
-    def __getitem__(self, point: Point) -> int:
-        return self._levels[point.y][point.x]
-
-    def is_within_boundary(self, point: Point) -> bool:
-        """ If given point exists within Caves boundary """
+        height, width = self._levels.shape
+        return width, height
+
+    def __getitem__(self, item) -> np.ndarray:
+        return self._levels[item]
+
+    def get_lowest(self) -> np.ndarray:
+        """ Mask of points lower than all their neighbors """
+        # surround cave with points higher than any other, so border points have all neighbors
+        padded = np.pad(self._levels, 1, constant_values=MAX_LVL + 1)
+        lowest_adjacent = np.minimum.reduce([
+            padded[:-2, 1:-1], padded[2:, 1:-1], padded[1:-1, :-2], padded[1:-1, 2:]
+        ])
+        return self._levels < lowest_adjacent
+
+    def label_basins(self) -> np.ndarray:
+        """ Flood fill all basins in one pass, points get label of their basin and top level points 0. """
         width, height = self.shape()
-        return (0 <= point.x < width) and (0 <= point.y < height)
-
-    def get_adjacent(self, point: Point) -> Point:
-        """ For given point generates adjacent points within Caves boundary. """
-        left = Point(point.x - 1, point.y)
-        right = Point(point.x + 1, point.y)
-        up = Point(point.x, point.y - 1)
-        down = Point(point.x, point.y + 1)
-
-        for p in [up, right, down, left]:
-            if self.is_within_boundary(p):
-                yield p
-
-    def is_lowest(self, point: Point) -> bool:
-        """ If given point is lowest among all it's neighbors """
-        return self[point] <= min(self[a] for a in self.get_adjacent(point))
-
-    def is_in_basin(self, point: Point) -> Optional[Point]:
-        """ If given points belongs to basin already, return it's lowest point """
-        for key, val in self.basins.items():
-            if point in val:
-                return key
-        return None
-
-    def add_basin(self, lowest_point: Point):
-        """ Create and populate basin for the given lowest point. """
-        # skip this point if it is already in basin (basin has multiple lowest points)
-        if not self.is_in_basin(lowest_point):
-            queue = [lowest_point]
+        size = width * height
+        is_basin = (self._levels < MAX_LVL).ravel().tolist()
+        labels = [0] * size
+        label = 0
+        # points are flat indexes into cave, basins are separated by top level points
+        for start in range(size):
+            if not is_basin[start] or labels[start]:
+                continue
+            label += 1
+            labels[start] = label
+            queue = [start]
             while queue:
                 point = queue.pop()
-                # add point to basin
-                self.basins[lowest_point].add(point)
-                for adj in self.get_adjacent(point):
-                    # skip top level point
-                    if self[adj] >= MAX_LVL:
-                        continue
-                    # skip point already in basin or in queue
-                    if self.is_in_basin(adj) or adj in queue:
-                        continue
-                    # add adjacent point to basin
-                    queue.append(adj)
-
-
-def parse_lines(input_file) -> list[list[int]]:
-    lines = []
+                x = point % width
+                adjacent = []
+                if point >= width:
+                    adjacent.append(point - width)
+                if point < size - width:
+                    adjacent.append(point + width)
+                if x > 0:
+                    adjacent.append(point - 1)
+                if x < width - 1:
+                    adjacent.append(point + 1)
+                for adj in adjacent:
+                    if is_basin[adj] and not labels[adj]:
+                        labels[adj] = label
+                        queue.append(adj)
+        return np.array(labels, dtype=np.int32).reshape(height, width)
+
+
+@lru_cache(maxsize=None)
+def parse_lines(input_file) -> np.ndarray:
     with open(input_file) as f:
-        for line in f:
-            lines.append([int(x) for x in line.strip()])
-    return lines
-
-
-def get_lowest_levels(caves: Cave) -> list[Point]:
-    """ Get risk level of all lowest points in Caves """
-    levels = []
-    for x in range(caves.shape()[0]):
-        for y in range(caves.shape()[1]):
-            p = Point(x, y)
-            if caves.is_lowest(p):
-                levels.append(p)
-
+        lines = f.read().split()
+    levels = np.frombuffer(''.join(lines).encode(), dtype=np.uint8).reshape(len(lines), -1) - ord('0')
+    levels = levels.astype(np.int8)
+    # parsed levels are shared between both parts
+    levels.flags.writeable = False
     return levels
 
 
 def get_three_largest_basins_size(caves: Cave) -> list[int]:
     """ Get size of three largest basins. """
-    # create basins for all lowest points
-    for p in get_lowest_levels(caves):
-        caves.add_basin(p)
-
-    basins = list(caves.basins.values())
-    basins.sort(key=len, reverse=True)
+    sizes = np.bincount(caves.label_basins().ravel())[1:]
+    # partition needs at least three basins, fewer of them are all the largest ones
+    largest = np.partition(sizes, -3)[-3:] if sizes.size > 3 else sizes
 
-    return [len(b) for b in basins[0:3]]
+    return sorted(largest.tolist(), reverse=True)
 
 
 # part 1
 def get_risk_level(input_file: str) -> int:
     caves = Cave(parse_lines(input_file))
-    return sum(caves[p] + 1 for p in get_lowest_levels(caves))
+    return int((caves[caves.get_lowest()] + 1).sum())
 
 
 def test_get_risk_level():
@@ -136,6 +115,13 @@ def test_get_three_largest_basins_size():
     assert test_size == 1134
 
 
+def test_get_three_largest_basins_size_few_basins():
+    one_basin = Cave(np.array([[1, 2], [3, 4]], dtype=np.int8))
+    assert get_three_largest_basins_size(one_basin) == [4]
+    two_basins = Cave(np.array([[1, 9, 2], [2, 9, 3]], dtype=np.int8))
+    assert get_three_largest_basins_size(two_basins) == [2, 2]
+
+
 if __name__ == "__main__":
     logging.basicConfig(stream=sys.stdout, level=logging.INFO)
 
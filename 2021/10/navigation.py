@@ -1,6 +1,7 @@
 # https://adventofcode.com/2021/day/10
 
 from timeit import default_timer as timer
+from statistics import median_low
 
 import sys
 import os
@@ -15,27 +16,37 @@ ERROR_SCORE = {
     '}': 1197,
     '>': 25137
 }
+AUTOCOMPLETE_SCORE = {
+    ')': 1,
+    ']': 2,
+    '}': 3,
+    '>': 4
+}
 PAIRS = dict((a, b) for a, b in ("()", "[]", "{}", "<>"))
 
+# lookup tables indexed by byte value
+CLOSER_OF = bytes(ord(PAIRS[chr(b)]) if chr(b) in PAIRS else 0 for b in range(256))
+ERROR_SCORE_OF = [ERROR_SCORE.get(chr(b), 0) for b in range(256)]
+AUTOCOMPLETE_SCORE_OF = [AUTOCOMPLETE_SCORE.get(chr(b), 0) for b in range(256)]
+
 
-def parse_lines(input_file) -> list[str]:
-    lines = []
-    with open(input_file) as f:
-        for line in f:
-            lines.append(line.strip())
+def parse_lines(input_file) -> list[bytes]:
+    with open(input_file, 'rb') as f:
+        lines = f.read().split()
     return lines
 
 
-def check_syntax(line: str, stack: list) -> int:
+def check_syntax(line: bytes, stack: bytearray) -> int:
     """ Check line syntax and return error score."""
     for char in line:
-        if char in PAIRS.keys():
-            stack.append(PAIRS[char])
-        elif stack[-1] == char:
+        closer = CLOSER_OF[char]
+        if closer:
+            stack.append(closer)
+        elif stack and stack[-1] == char:
             stack.pop()
         else:
-            logging.debug(f'Found illegal {char} instead of {stack[-1]}')
-            return ERROR_SCORE[char]
+            logging.debug(f'Found illegal {chr(char)} instead of {chr(stack[-1]) if stack else None}')
+            return ERROR_SCORE_OF[char]
     return 0
 
 
@@ -45,7 +56,7 @@ def get_error_score(input_file: str) -> int:
     lines = parse_lines(input_file)
     error_score = 0
     for line in lines:
-        stack = []
+        stack = bytearray()
         error_score += check_syntax(line, stack)
     return error_score
 
@@ -61,17 +72,16 @@ def get_autocomplete_score(input_file: str) -> int:
     lines = parse_lines(input_file)
     scores = []
     for line in lines:
-        stack = []
+        stack = bytearray()
         score = 0
         err = check_syntax(line, stack)
         if not err:
             for elem in reversed(stack):
-                score *= 5
-                score += list(PAIRS.values()).index(elem) + 1
+                score = score * 5 + AUTOCOMPLETE_SCORE_OF[elem]
         if score:
             scores.append(score)
-    scores.sort()
-    return scores[len(scores) // 2]
+    # number of scores is odd, so middle one is the median
+    return median_low(scores)
 
 
 def test_get_autocomplete_score():
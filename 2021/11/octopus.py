@@ -1,101 +1,105 @@
 # https://adventofcode.com/2021/day/11
 
 from timeit import default_timer as timer
-from dataclasses import dataclass
-from collections import namedtuple
+from dataclasses import dataclass, field
+from functools import lru_cache
 
 import sys
 import os
 import logging
 
+import numpy as np
+
 INPUT_FILE = 'input.txt'
 INPUT_TEST = 'input_test.txt'
 
 STEPS = 100
 FLASH_POINT = 9
 
-Point = namedtuple('Point', 'x y')
+# shifts of all adjacent points (including diagonal)
+ADJACENT = [(0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1)]
 
 
 @dataclass(frozen=False)
 class Cavern:
     """ Represent cavern full of octopuses and their flashing in darkness. """
-    _levels: list[list[int]]  # Levels of brightness of each octopus
+    grid: np.ndarray  # Levels of brightness of each octopus at start
     flashes: int = 0
+    _levels: list[int] = field(init=False)  # Levels of brightness of each octopus, flat row by row
+    _adjacent: list[list[int]] = field(init=False)  # Flat indexes of adjacent octopuses for each octopus
 
     def __post_init__(self):
-        if not self._levels:
-            raise ValueError('Must provide non-empty list of lists when creating cavern.')
+        if not self.grid.size:
+            raise ValueError('Must provide non-empty grid when creating cavern.')
+        width, height = self.shape
+        self._levels = self.grid.ravel().tolist()
+        self._adjacent = [
+            [
+                (y + adj_y) * width + x + adj_x for adj_x, adj_y in ADJACENT
+                if 0 <= x + adj_x < width and 0 <= y + adj_y < height
+            ]
+            for y in range(height) for x in range(width)
+        ]
 
     @property
     def shape(self) -> tuple[int, int]:
         """ Shape of cave X x Y """
-        return len(self._levels[0]), len(self._levels)
+        height, width = self.grid.shape
+        return width, height
 
     @property
     def count(self):
         """ Total count of octopuses in cavern """
-        return len(self._levels[0]) * len(self._levels)
-
-    def __getitem__(self, point: Point) -> int:
-        return self._levels[point.y][point.x]
-
-    def __setitem__(self, key: Point, value: int) -> None:
-        self._levels[key.y][key.x] = value
+        return len(self._levels)
 
     def __repr__(self) -> str:
-        return '\n' + '\n'.join(str(row) for row in self._levels)
-
-    def is_within_boundary(self, point: Point) -> bool:
-        """ If given point exists within Cavern boundary """
-        width, height = self.shape
-        return (0 <= point.x < width) and (0 <= point.y < height)
-
-    def get_adjacent(self, point: Point) -> Point:
-        """ For given point generates adjacent points (including diagonal) within Cavern boundary. """
-        coords = {(0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1)}
-
-        for adj in [Point(point.x + x, point.y + y) for x, y in coords]:
-            if self.is_within_boundary(adj):
-                yield adj
-
-    def raise_level(self, point: Point, flashed: set) -> None:
-        """ Raises level of given point and flash neighbors if conditions are met. """
-        if point in flashed:
-            # skip if already flashed this step
-            pass
-        elif self[point] == FLASH_POINT:
-            # reset if we reached flash point and raise all neighbors by 1
-            self[point] = 0
-            flashed.add(point)
-            self.flashes += 1
-            for adj in self.get_adjacent(point):
-                self.raise_level(adj, flashed)
-        else:
-            self[point] += 1
-
-    def step(self, flashed_this_step):
-        """ Run one day in cavern that raises level by 1 """
-        for width in range(self.shape[0]):
-            for height in range(self.shape[1]):
-                point = Point(width, height)
-                self.raise_level(point, flashed=flashed_this_step)
-
-
-def parse_lines(input_file) -> list[list[int]]:
-    lines = []
+        width, _ = self.shape
+        return '\n' + '\n'.join(str(self._levels[i:i + width]) for i in range(0, self.count, width))
+
+    def step(self) -> int:
+        """ Run one day in cavern that raises level by 1, returns how many octopuses flashed. """
+        levels = self._levels
+        # raise all levels, octopuses over flash point are waiting to flash
+        stack = []
+        for point in range(self.count):
+            levels[point] += 1
+            if levels[point] > FLASH_POINT:
+                stack.append(point)
+        count = 0
+        while stack:
+            point = stack.pop()
+            if not levels[point]:
+                # skip if already flashed this step
+                continue
+            # reset flashing octopus and raise all neighbors by 1
+            levels[point] = 0
+            count += 1
+            for adj in self._adjacent[point]:
+                # flashed octopuses stay at zero until end of step
+                if levels[adj]:
+                    levels[adj] += 1
+                    if levels[adj] > FLASH_POINT:
+                        stack.append(adj)
+        self.flashes += count
+        return count
+
+
+@lru_cache(maxsize=None)
+def parse_lines(input_file) -> np.ndarray:
     with open(input_file) as f:
-        for line in f:
-            lines.append([int(x) for x in list(line.strip())])
-    return lines
+        lines = f.read().split()
+    levels = np.frombuffer(''.join(lines).encode(), dtype=np.uint8).reshape(len(lines), -1) - ord('0')
+    levels = levels.astype(np.int8)
+    # parsed levels are shared between both parts
+    levels.flags.writeable = False
+    return levels
 
 
 def count_flashes(input_file: str) -> int:
     cavern = Cavern(parse_lines(input_file))
     for day in range(STEPS):
-        flashed_this_step = set()
-        cavern.step(flashed_this_step)
-        logging.debug(f'Day {day + 1}: flashed {len(flashed_this_step)} times!\n')
+        count = cavern.step()
+        logging.debug(f'Day {day + 1}: flashed {count} times!\n')
         logging.debug(cavern)
     return cavern.flashes
 
@@ -110,10 +114,8 @@ def get_step_all_flash(input_file: str) -> int:
     cavern = Cavern(parse_lines(input_file))
     day = 0
     while True:
-        flashed_this_step = set()
         day += 1
-        cavern.step(flashed_this_step)
-        count = len(flashed_this_step)
+        count = cavern.step()
         logging.debug(f'Day {day}: flashed {count} times!\n')
         if count == cavern.count:
             logging.debug(f'Day {day} all flashed!')
@@ -4,7 +4,8 @@ from __future__ import annotations
 
 from timeit import default_timer as timer
 from dataclasses import dataclass, field
-from collections import defaultdict, Counter
+from collections import defaultdict
+from functools import lru_cache
 
 import sys
 import os
@@ -17,24 +18,6 @@ START_NODE = 'start'
 END_NODE = 'end'
 
 
-def can_visit(node: str, path: list, only_once: bool) -> bool:
-    """ Logic to determine how many times we can visit node in graph """
-    # cave is big or on yet visited
-    if not node.islower() or node not in path:
-        result = True
-    # cave is start or end and already visited
-    elif node in (START_NODE, END_NODE):
-        result = False
-    # cave is small and already visited - and can be only once
-    elif only_once:
-        result = False
-    # cave is small, already visited but can be visited twice once
-    else:
-        lower_count = Counter(v for v in path if v.islower())
-        result = bool(2 not in lower_count.values())
-    return result
-
-
 @dataclass
 class Graph:
     """ Class for non-oriented graph that can find all paths from A to B """
@@ -55,33 +38,45 @@ class Graph:
         self.graph[a].append(b)
         self.graph[b].append(a)
 
-    def find_all_paths(self, start: str, end: str, path: list[str], only_once: bool = True) -> list[list[str]]:
-        """ Find all paths between start and end nodes, allow more complex logic with can_visit() function """
-        # add start node to path
-        path = path + [start]
-        # we reached end and can return path
-        if start == end:
-            return [path]
-        # there is no way to continue, return empty path
+    def count_all_paths(self, start: str, end: str, only_once: bool = True) -> int:
+        """
+        Count all paths between start and end nodes. Big caves can be visited any number of times,
+        small caves only once - or one of them twice if only_once is False.
+        """
         if start not in self.graph:
-            return []
-        # get all paths that continue from starting node
-        paths = []
-        for node in self.graph[start]:
-            # check that we can visit node given existing path
-            if can_visit(node, path, only_once):
-                new_paths = self.find_all_paths(node, end, path, only_once)
-                for new_path in new_paths:
-                    paths.append(new_path)
-
-        return paths
+            return 0
+        # nodes are numbered, so the search works with plain ints and lists
+        names = list(self.graph)
+        ids = {name: i for i, name in enumerate(names)}
+        # start cannot be visited again
+        neighbors = [[ids[node] for node in self.graph[name] if node != start] for name in names]
+        # small caves get their own bit in mask of visited caves, big caves have none
+        small_bits = [1 << i if name.islower() else 0 for i, name in enumerate(names)]
+        end_id = ids.get(end)
+
+        # number of paths depends only on node and visiting state, so same subproblems are counted once
+        @lru_cache(maxsize=None)
+        def count_from(node: int, visited: int, twice_used: bool) -> int:
+            # we reached end and found one path
+            if node == end_id:
+                return 1
+            count = 0
+            for adj in neighbors[node]:
+                bit = small_bits[adj]
+                if not visited & bit:
+                    count += count_from(adj, visited | bit, twice_used)
+                elif not only_once and not twice_used:
+                    # small cave already visited, but one of them can be visited twice
+                    count += count_from(adj, visited, True)
+            return count
+
+        return count_from(ids[start], 0, False)
 
 
 # part 1
 def count_paths(input_file: str) -> int:
     graph = Graph.parse_lines(input_file)
-    paths = graph.find_all_paths(START_NODE, END_NODE, [])
-    return len(paths)
+    return graph.count_all_paths(START_NODE, END_NODE)
 
 
 def test_count_paths():
@@ -93,8 +88,7 @@ def test_count_paths():
 
 def count_paths_twice(input_file: str) -> int:
     graph = Graph.parse_lines(input_file)
-    paths = graph.find_all_paths(START_NODE, END_NODE, [], only_once=False)
-    return len(paths)
+    return graph.count_all_paths(START_NODE, END_NODE, only_once=False)
 
 
 def test_count_paths_twice():
@@ -4,17 +4,16 @@ from __future__ import annotations
 
 from timeit import default_timer as timer
 from dataclasses import dataclass, field
-from collections import namedtuple
 
 import sys
 import os
 import logging
 
+import numpy as np
+
 INPUT_FILE = 'input.txt'
 INPUT_TEST = 'input_test.txt'
 
-Point = namedtuple('Point', ['x', 'y'])
-
 
 @dataclass
 class Origami:
@@ -23,36 +22,32 @@ class Origami:
     _num_folds = 0
     _fold_width: int = 0
     _fold_height: int = 0
-    _paper: set[Point] = field(default_factory=set, init=False)
+    _paper: np.ndarray = field(default_factory=lambda: np.empty((0, 2), dtype=np.int32), init=False)  # x, y rows
 
     @classmethod
     def parse_file(cls, input_file, max_folds: int) -> Origami:
         origami = cls(max_folds)
         with open(input_file) as f:
-            for line in f:
-                if 'fold along y=' in line:
-                    _, num = line.strip().split('=')
-                    origami.add_fold(line_y=int(num))
-                elif 'fold along x=' in line:
-                    _, num = line.strip().split('=')
-                    origami.add_fold(line_x=int(num))
-                elif line.strip():
-                    x, y = line.strip().split(',')
-                    origami.add_point(int(x), int(y))
+            points_block, _, folds_block = f.read().strip().partition('\n\n')
+
+        points = np.array(points_block.replace(',', ' ').split(), dtype=np.int32).reshape(-1, 2)
+        origami._paper = np.unique(points, axis=0)
+        for line in folds_block.split():
+            if line.startswith('y='):
+                origami.add_fold(line_y=int(line[2:]))
+            elif line.startswith('x='):
+                origami.add_fold(line_x=int(line[2:]))
         return origami
 
     def __len__(self) -> int:
         return len(self._paper)
 
     def __repr__(self) -> str:
-        rows = []
-        for y in range(self.height):
-            row = ''
-            for x in range(self.width):
-                point = Point(x, y)
-                row += '#' if point in self._paper else '.'
-            rows.append(row)
-        return '\n' + '\n'.join(row for row in rows)
+        paper = np.full((self.height, self.width), ord('.'), dtype=np.uint8)
+        x, y = self._paper.T
+        visible = (x < self.width) & (y < self.height)
+        paper[y[visible], x[visible]] = ord('#')
+        return '\n' + '\n'.join(row.tobytes().decode() for row in paper)
 
     @property
     def width(self) -> int:
@@ -62,9 +57,14 @@ class Origami:
     def height(self) -> int:
         return self._fold_height
 
-    def add_point(self, x: int, y: int) -> None:
-        """ Adds point on origami paper. """
-        self._paper.add(Point(x, y))
+    def flip_over(self, axis: int, line: int) -> None:
+        """ Flips points behind the fold line over it, points flipped beyond border of paper are discarded. """
+        paper = self._paper.copy()
+        coords = paper[:, axis]
+        coords[:] = np.where(coords > line, 2 * line - coords, coords)
+        logging.debug(f'Discarding {np.count_nonzero(coords < 0)} points flipped beyond border.')
+        # points landing on top of each other merge into one
+        self._paper = np.unique(paper[coords >= 0], axis=0)
 
     def add_fold(self, line_x: int = None, line_y: int = None) -> None:
         """ Folds origami paper up or left. """
@@ -74,27 +74,11 @@ class Origami:
         if line_x:
             # we are folding to the left
             self._fold_width = line_x
-            for point in self._paper.copy():
-                if point.x > self._fold_width:
-                    # this point is to the right from fold and needs to be flipped
-                    self._paper.remove(point)
-                    flipped_point = Point(2 * line_x - point.x, point.y)
-                    if flipped_point.x >= 0:
-                        self._paper.add(flipped_point)
-                    else:  # point is flipped beyond border of paper
-                        logging.debug(f'Discarding {point} (flipped to {flipped_point}')
+            self.flip_over(axis=0, line=line_x)
         elif line_y:
             # we are folding up
             self._fold_height = line_y
-            for point in self._paper.copy():
-                if point.y > self._fold_height:
-                    # this point is down from fold and needs to be flipped
-                    self._paper.remove(point)
-                    flipped_point = Point(point.x, 2 * line_y - point.y)
-                    if flipped_point.y >= 0:
-                        self._paper.add(flipped_point)
-                    else:  # point is flipped beyond border of paper
-                        logging.debug(f'Discarding {flipped_point}')
+            self.flip_over(axis=1, line=line_y)
         self._num_folds += 1
 
 
@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
-import itertools
 import logging
 import os
 import sys
 from collections import Counter
 from dataclasses import dataclass, field
+from functools import lru_cache
 from timeit import default_timer as timer
-from typing import Protocol
+from typing import Callable, Protocol
+
+import numpy as np
 
 INPUT_FILE = 'input.txt'
 INPUT_TEST = 'input_test.txt'
@@ -17,16 +19,17 @@ INPUT_TEST = 'input_test.txt'
 
 def parse_lines(input_file: str) -> tuple[list, dict]:
     """ Parse input file for polymer template and insertion rules. """
-    rules = dict()
     with open(input_file) as f:
-        polymers = list(f.readline().strip())
-        for line in f:
-            if line.strip():
-                pair, insert_char = line.strip().split(' -> ')
-                assert len(pair) == 2, f'rule: {pair} must be two character long'
-                assert len(insert_char) == 1, f'rule: {insert_char} must be one character long'
-                rules[tuple(pair)] = insert_char
-    return polymers, rules
+        template, _, rules_block = f.read().strip().partition('\n\n')
+
+    rules = dict()
+    for line in rules_block.splitlines():
+        if line.strip():
+            pair, insert_char = line.strip().split(' -> ')
+            assert len(pair) == 2, f'rule: {pair} must be two character long'
+            assert len(insert_char) == 1, f'rule: {insert_char} must be one character long'
+            rules[(pair[0], pair[1])] = insert_char
+    return list(template), rules
 
 
 class PolymerProtocol(Protocol):
@@ -49,15 +52,43 @@ class PolymerProtocol(Protocol):
 
 @dataclass
 class Polymers(PolymerProtocol):
-    """ Implements PolymerProtocol. Polymer template is stored as list. """
+    """
+    Implements PolymerProtocol. Only the initial template and number of steps are stored,
+    letters inserted between every pair of the template are counted by memoized recursion.
+    """
     _init_template: list[str]
     _rules: dict[tuple[str, str], str]
+    _steps: int = field(default=0, init=False)
+    _expand: Callable[[tuple[str, str], int], Counter] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        rules = self._rules
+
+        @lru_cache(maxsize=None)
+        def expand(pair: tuple[str, str], depth: int) -> Counter:
+            """ Count letters inserted between pair of letters within given number of steps. """
+            insert_char = rules.get(pair)
+            if depth == 0 or insert_char is None:
+                return Counter()
+            inserted = Counter(insert_char)
+            inserted += expand((pair[0], insert_char), depth - 1)
+            inserted += expand((insert_char, pair[1]), depth - 1)
+            return inserted
+
+        self._expand = expand
 
     def __len__(self) -> int:
-        return len(self._init_template)
+        return sum(self._get_char_counter().values())
 
     def __repr__(self) -> str:
-        return ''.join(self._init_template)
+        def render(pair: tuple[str, str], depth: int) -> str:
+            insert_char = self._rules.get(pair)
+            if depth == 0 or insert_char is None:
+                return ''
+            return render((pair[0], insert_char), depth - 1) + insert_char + render((insert_char, pair[1]), depth - 1)
+
+        pairs = zip(self._init_template, self._init_template[1:])
+        return self.first_char + ''.join(render(pair, self._steps) + pair[1] for pair in pairs)
 
     @property
     def first_char(self):
@@ -67,33 +98,34 @@ class Polymers(PolymerProtocol):
     def last_char(self):
         return self._init_template[-1]
 
+    def _get_char_counter(self) -> Counter:
+        char_counter = Counter(self._init_template)
+        for pair in zip(self._init_template, self._init_template[1:]):
+            char_counter += self._expand(pair, self._steps)
+        return char_counter
+
     def step(self) -> None:
-        new_template = []
-        iter_a, iter_b = itertools.tee(self._init_template)
-        next(iter_b, None)
-        # generate all pairs from two iterators
-        for pair in zip(iter_a, iter_b):
-            # always append first from pair to template
-            new_template.append(pair[0])
-            if pair in self._rules:
-                # if pair matches rule, insert new character to template
-                new_template.append(self._rules[pair])
-        # append last character at the end
-        new_template.append(self.last_char)
-        self._init_template = new_template
+        self._steps += 1
 
     def get_counts(self) -> tuple[int, int]:
-        char_counter = Counter(self._init_template)
-        char_counts = char_counter.most_common()
+        char_counts = self._get_char_counter().most_common()
         return char_counts[0][1], char_counts[-1][1]
 
 
 @dataclass
 class BigPolymers(PolymerProtocol):
-    """ Implements PolymerProtocol. Big polymer template is converted into counter of template pairs. """
+    """
+    Implements PolymerProtocol. Big polymer template is converted into counts of template pairs.
+    Pair of letters `a`, `b` is stored at index `a * len(alphabet) + b` of the counts array.
+    """
     _init_template: list[str]
     _rules: dict[tuple[str, str], str]
-    _pairs: Counter = field(init=False)
+    _alphabet: list[str] = field(init=False)
+    _pairs: np.ndarray = field(init=False)
+    _next_pairs: np.ndarray = field(init=False)  # buffer reused for pair counts of the next step
+    _rule_pair: np.ndarray = field(init=False)
+    _rule_left: np.ndarray = field(init=False)
+    _rule_right: np.ndarray = field(init=False)
 
     @property
     def first_char(self):
@@ -104,30 +136,46 @@ class BigPolymers(PolymerProtocol):
         return self._init_template[-1]
 
     def __post_init__(self):
-        self._pairs = Counter(zip(self._init_template, self._init_template[1:]))
+        self._alphabet = sorted(set(self._init_template).union(*self._rules, self._rules.values()))
+        char_to_i = {char: i for i, char in enumerate(self._alphabet)}
+        size = len(self._alphabet)
+
+        template = np.array([char_to_i[char] for char in self._init_template], dtype=np.int64)
+        self._pairs = np.bincount(template[:-1] * size + template[1:], minlength=size * size)
+        self._next_pairs = np.empty_like(self._pairs)
+
+        # every rule moves count of its pair into the two pairs created by the insertion
+        rules = np.array([(char_to_i[a], char_to_i[b], char_to_i[char]) for (a, b), char in self._rules.items()],
+                         dtype=np.int64).reshape(-1, 3)
+        left, right, insert = rules.T
+        self._rule_pair = left * size + right
+        self._rule_left = left * size + insert
+        self._rule_right = insert * size + right
 
     def __len__(self) -> int:
-        return sum(self._pairs.values()) + 1
+        return int(self._pairs.sum()) + 1
 
     def __repr__(self) -> str:
-        return repr(self._pairs)
+        size = len(self._alphabet)
+        return repr({self._alphabet[i // size] + self._alphabet[i % size]: int(self._pairs[i])
+                     for i in np.flatnonzero(self._pairs)})
 
     def step(self) -> None:
-        new_counter = Counter()
-        for pair, char in self._rules.items():
-            if pair in self._pairs:
-                count = self._pairs.pop(pair)
-                new_counter[(pair[0], char)] += count
-                new_counter[(char, pair[1])] += count
-        self._pairs.update(new_counter)
+        counts = self._pairs[self._rule_pair]
+        new_pairs = self._next_pairs
+        np.copyto(new_pairs, self._pairs)
+        new_pairs[self._rule_pair] -= counts
+        np.add.at(new_pairs, self._rule_left, counts)
+        np.add.at(new_pairs, self._rule_right, counts)
+        self._pairs, self._next_pairs = new_pairs, self._pairs
 
     def get_counts(self) -> tuple[int, int]:
-        char_counter = Counter({self.first_char: 1, self.last_char: 1})
-        for pair, count in self._pairs.items():
-            char_counter[pair[0]] += count
-            char_counter[pair[1]] += count
-        char_counts = char_counter.most_common()
-        return char_counts[0][1] // 2, char_counts[-1][1] // 2
+        size = len(self._alphabet)
+        # every letter except the last one of template starts exactly one pair
+        char_counts = self._pairs.reshape(size, size).sum(axis=1)
+        char_counts[self._alphabet.index(self.last_char)] += 1
+        char_counts = char_counts[char_counts > 0]
+        return int(char_counts.max()), int(char_counts.min())
 
 
 # part 1
@@ -140,13 +188,13 @@ def get_polymer_quantity(polymers: PolymerProtocol, days: int) -> int:
 
 
 def test_get_polymer_quantity():
-    polymers = Polymers(parse_lines(os.path.join(os.path.dirname(__file__), INPUT_TEST)))
+    polymers = Polymers(*parse_lines(os.path.join(os.path.dirname(__file__), INPUT_TEST)))
     test_quantity = get_polymer_quantity(polymers=polymers, days=10)
     assert test_quantity == 1588
 
 
 def test_get_big_polymer_quantity():
-    polymers = BigPolymers(parse_lines(os.path.join(os.path.dirname(__file__), INPUT_TEST)))
+    polymers = BigPolymers(*parse_lines(os.path.join(os.path.dirname(__file__), INPUT_TEST)))
     test_quantity = get_polymer_quantity(polymers=polymers, days=40)
     assert test_quantity == 2188189693529
 
@@ -154,16 +202,14 @@ def test_get_big_polymer_quantity():
 if __name__ == "__main__":
     logging.basicConfig(stream=sys.stdout, level=logging.INFO)
 
-    big_polymers = BigPolymers(parse_lines(INPUT_FILE))
-
     start_time = timer()
-    quantity = get_polymer_quantity(big_polymers, 10)
+    quantity = get_polymer_quantity(BigPolymers(*parse_lines(INPUT_FILE)), 10)
     end_time = timer()
     logging.info(f'({end_time - start_time:.4f}s elapsed) '
                  f'Quantity after 10 days is: {quantity}.')
 
     start_time = timer()
-    quantity = get_polymer_quantity(big_polymers, 40)
+    quantity = get_polymer_quantity(BigPolymers(*parse_lines(INPUT_FILE)), 40)
     end_time = timer()
     logging.info(f'({end_time - start_time:.4f}s elapsed) '
                  f'Quantity after 40 days is: {quantity}.')
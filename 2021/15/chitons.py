@@ -6,16 +6,18 @@ import logging
 import os
 import sys
 from collections import namedtuple
-from dataclasses import dataclass, field
-from queue import PriorityQueue
+from dataclasses import dataclass
+from heapq import heappop, heappush
 from timeit import default_timer as timer
-from typing import Iterator
+
+import numpy as np
 
 INPUT_FILE = 'input.txt'
 INPUT_TEST = 'input_test.txt'
 INPUT_TEST2 = 'input_test2.txt'
 
 WEIGHT_CAP = 9
+UNREACHED = np.iinfo(np.int32).max
 ENLARGEMENT_COEF = 5
 
 Point = namedtuple('Point', 'x y')
@@ -25,129 +27,102 @@ Point = namedtuple('Point', 'x y')
 class Graph:
     """ Graph with edge weights, neighbors suitable for Dijkstra algorithm. Capable of enlargement. """
 
-    risk_level: list[list[int]]  # grid representation with edge weights stored under target point
-    solved_points: set = field(default_factory=set, init=False)  # structure for storing already solved vertices
+    risk_level: np.ndarray  # int8 grid representation with edge weights stored under target point
 
     @property
     def width(self) -> int:
-        return len(self.risk_level[0])
+        return self.risk_level.shape[1]
 
     @property
     def height(self) -> int:
-        return len(self.risk_level)
+        return self.risk_level.shape[0]
 
     def get_end_point(self) -> Point:
         """ Get end point which is on bottom right of grid. """
         return Point(self.width - 1, self.height - 1)
 
     def __eq__(self, other: Graph) -> bool:
-        return self.risk_level == other.risk_level
+        return np.array_equal(self.risk_level, other.risk_level)
 
     def __len__(self) -> int:
         return self.width * self.height
 
-    def __getitem__(self, vertex: Point) -> int | None:
+    def __getitem__(self, vertex: Point) -> int:
         """ Get edge weight for target vertex. """
-        return self.risk_level[vertex.y][vertex.x]
+        return int(self.risk_level[vertex.y, vertex.x])
 
     def __repr__(self) -> str:
         return '\n' + '\n'.join(str(row) for row in self.risk_level)
 
-    def is_within_boundary(self, point: Point) -> bool:
-        """ Test if given point fits within grid boundary. """
-        return (0 <= point.x < self.width) and (0 <= point.y < self.height)
-
-    def get_neighbors(self, point: Point) -> Point:
-        """ For given point generate adjacent points within grid boundary. """
-        for adj in [Point(point.x + x, point.y + y) for x, y in {(0, -1), (1, 0), (0, 1), (-1, 0)}]:
-            if self.is_within_boundary(adj):
-                yield adj
-
-    def all_points(self) -> Iterator[Point]:
-        """ Generate all points within graph. """
-        for x in range(self.width):
-            for y in range(self.height):
-                yield Point(x, y)
-
     def enlarge(self, coefficient: int):
         """ Enlarge graph by copying existing grid but raising the risk levels. """
-        def raise_risk(input_row: list[int], times: int) -> list[int]:
-            """ Raises risk for whole row. """
-            return [x + times if x + times <= WEIGHT_CAP else x + times - WEIGHT_CAP for x in input_row]
-
-        # add more columns
-        large_rows = []
-        for row in self.risk_level:
-            large_row = []
-            for i in range(0, coefficient):
-                large_row += raise_risk(row, times=i)
-            large_rows.append(large_row)
-
-        # add more rows
-        for i in range(1, coefficient):
-            for large_row in large_rows[0:len(self.risk_level)]:
-                large_rows.append(raise_risk(large_row, times=i))
-
-        self.risk_level = large_rows
+        height, width = self.risk_level.shape
+        # every tile is raised by the sum of its row and column index, risk wraps around from WEIGHT_CAP back to 1
+        tile_offsets = np.add.outer(np.arange(coefficient), np.arange(coefficient)).astype(np.int16)
+        offsets = np.kron(tile_offsets, np.ones((height, width), dtype=np.int16))
+        large_grid = np.tile(self.risk_level.astype(np.int16), (coefficient, coefficient))
+        self.risk_level = ((large_grid - 1 + offsets) % WEIGHT_CAP + 1).astype(np.int8)
 
 
 def parse_lines(input_file: str) -> Graph:
     """ Parse input file for graph representation. """
-    rows = []
-    with open(input_file) as f:
-        for line in f:
-            if line.strip():
-                rows.append([int(x) for x in list(line.strip())])
+    with open(input_file, 'rb') as f:
+        rows = f.read().split()
 
-    graph = Graph(rows)
+    # digits are read directly from bytes, every row must have the same width
+    risk_level = np.frombuffer(b''.join(rows), dtype=np.uint8).reshape(len(rows), -1) - ord('0')
+    graph = Graph(risk_level.astype(np.int8))
     return graph
 
 
-def dijkstra(graph: Graph, start_vertex: Point) -> dict[Point, int]:
-    """ Dijkstra's algorithm for finding all shortest paths from start within given graph. """
-
-    graph.solved_points = set()
-    shortest_path: dict[Point, int | None] = {point: None for point in graph.all_points()}
+def dijkstra(graph: Graph, start_vertex: Point) -> np.ndarray:
+    """
+    Dijkstra's algorithm for finding all shortest paths from start within given graph.
+    Returns int32 grid of graph's shape with the shortest distance stored under every point.
+    """
+    # vertices are flat indexes `y * width + x` into row-major grid
+    width, size = graph.width, len(graph)
+    risk_flat = graph.risk_level.ravel().tolist()
+    shortest_path = [UNREACHED] * size
 
     # start by adding the distance to the starting vertex, which is zero
-    shortest_path[start_vertex] = 0
-    # we create priority queue sorted by distance to the current vertex
-    priority_queue: PriorityQueue[tuple[int, Point]] = PriorityQueue()
+    start = start_vertex.y * width + start_vertex.x
+    shortest_path[start] = 0
+    # we create priority queue (binary heap) sorted by distance to the current vertex
     # at the beginning we put inside only the starting vertex with weight = 0
-    priority_queue.put((0, start_vertex))
+    priority_queue: list[tuple[int, int]] = [(0, start)]
     # calculate the shortest path for all the points in queue
-    while not priority_queue.empty():
+    while priority_queue:
         # remove current vertex from priority queue
-        current_distance, current_vertex = priority_queue.get()
-        # add current vertex to solved set
-        graph.solved_points.add(current_vertex)
-        # solve all it's neighbors
-        for neighbor in graph.get_neighbors(current_vertex):
-            # get edge weight between current vertex and it's neighbor
-            distance = graph[neighbor]
-            # skip this neighbor if it's already solved
-            if neighbor in graph.solved_points:
+        current_distance, current_vertex = heappop(priority_queue)
+        # skip stale entry if the vertex was already solved through a shorter path
+        if current_distance > shortest_path[current_vertex]:
+            continue
+        # solve all it's neighbors, the ones beyond left or right edge are marked as -1
+        x = current_vertex % width
+        for neighbor in (current_vertex - width, current_vertex + width,
+                         current_vertex - 1 if x > 0 else -1, current_vertex + 1 if x < width - 1 else -1):
+            if not 0 <= neighbor < size:
                 continue
-            # get previously stored distance for this neighbor
-            old_cost = shortest_path[neighbor]
             # calculate new distance for neighbor using edge from current vertex
-            new_cost = current_distance + distance
-            # if new distance is shorter or old distance is not yet calculated
-            if not old_cost or new_cost < old_cost:
+            new_cost = current_distance + risk_flat[neighbor]
+            # if new distance is shorter than previously stored distance for this neighbor
+            if new_cost < shortest_path[neighbor]:
                 # store the new shortest distance for the neighbor
                 shortest_path[neighbor] = new_cost
                 # place the neighbor into priority queue so all it's neighbors can be solved as well
-                priority_queue.put((new_cost, neighbor))
+                heappush(priority_queue, (new_cost, neighbor))
 
     # return shortest paths for all paths starting in starting vertex
-    return shortest_path
+    return np.array(shortest_path, dtype=np.int32).reshape(graph.height, width)
 
 
 # part 1
 def get_total_risk(graph: Graph) -> int:
     """ Get total risk level of the shortest path from start to end """
     risks = dijkstra(graph=graph, start_vertex=Point(0, 0))
-    return risks[graph.get_end_point()]
+    end_point = graph.get_end_point()
+    return int(risks[end_point.y, end_point.x])
 
 
 def test_get_total_risk():
@@ -4,18 +4,30 @@ from __future__ import annotations
 
 import logging
 import sys
-from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from functools import reduce
-from operator import mul
+from dataclasses import dataclass
+from math import prod
 from timeit import default_timer as timer
-from typing import Iterator
+from typing import Callable
 
 import pytest
 
 INPUT_FILE = 'input.txt'
 INPUT_TEST = 'input_test.txt'
 
+LITERAL_TYPE_ID = 4
+
+# operations over values of sub-packets indexed by type ID, literal value packets carry their value instead
+OPERATIONS: tuple[Callable[[list[int]], int] | None, ...] = (
+    sum,
+    prod,
+    min,
+    max,
+    None,
+    lambda values: int(values[0] > values[1]),
+    lambda values: int(values[0] < values[1]),
+    lambda values: int(values[0] == values[1]),
+)
+
 
 @dataclass
 class Message:
@@ -28,61 +40,8 @@ class Message:
     ID 5 greater than packets - 1 if first sub-packet is greater than second sub-packet; otherwise 0
     ID 6 less than packets - 1 if first sub-packet is smaller than second sub-packet; otherwise 0
     ID 7 equal to packets - 1 if first sub-packet is equal to second sub-packet; otherwise 0
-    """
-    binary: str
-
-    def __repr__(self) -> str:
-        return self.binary
-
-    def __len__(self) -> int:
-        return len(self.binary)
-
-    def read_bits(self, num_bits: int) -> str:
-        result = self.binary[:num_bits]
-        logging.debug(f'Reading {num_bits} bits from message of length {len(self)}.'
-                      f' -> {result}')
-        self.binary = self.binary[num_bits:]
-        return result
-
-    def read(self, num_bits: int) -> int:
-        result = self.read_bits(num_bits)
-        return int(result, 2)
-
-    def parse(self) -> Packet:
-        version = self.read(3)
-        type_id = self.read(3)
-        logging.debug(f'Parsing message ({len(self.binary)}):\n'
-                      f'\t{self.binary}')
-
-        if type_id == 4:
-            packet = LiteralValuePacket(version=version, type_id=type_id, message=self)
-        else:
-            packet = OperatorPacket(version=version, type_id=type_id, message=self)
-        return packet
 
-
-@dataclass
-class Packet(ABC):
-    version: int
-    type_id: int
-    message: Message
-
-    @abstractmethod
-    def __repr__(self) -> str:
-        pass
-
-    @abstractmethod
-    def parse(self) -> None:
-        pass
-
-    @abstractmethod
-    def get_value(self) -> int:
-        pass
-
-
-@dataclass
-class LiteralValuePacket(Packet):
-    """
+    Literal value packet:
     - type_id = 4
     - padded to 4 bits
     - 1 b - next 4 bits contain value
@@ -90,33 +49,8 @@ class LiteralValuePacket(Packet):
         = 0 -> last part
     - e.g. 110.100.1-0111.1-1110.0-0101.000
         = ver 6, id 4, literal: 2021, padding
-    """
-    value: int = field(init=False)
 
-    def __post_init__(self):
-        self.parse()
-
-    def __repr__(self) -> str:
-        return repr(f'Version: {self.version}, Value: {self.value}')
-
-    def get_value(self) -> int:
-        return self.value
-
-    def parse(self) -> None:
-        logging.debug(f'Parsing LiteralValuePacket (ver: {self.version}) with message ({len(self.message)}):\n'
-                      f'\t{self.message}')
-        value = 0
-        has_more_parts = 1
-        while has_more_parts:
-            has_more_parts = self.message.read(1)
-            # value = (value * 16) + self.message.read(4)
-            value = (value << 4) | self.message.read(4)
-        self.value = value
-
-
-@dataclass
-class OperatorPacket(Packet):
-    """
+    Operator packet:
     - performs operation on sub-packets within
     - 1 bit - length type id
         -> 0 - 15 bits = total length of all sub-packets within
@@ -125,88 +59,87 @@ class OperatorPacket(Packet):
     - e.g. 001.110.0-000000000011011 || 110.100-0-1010 | 010.100.1-0001.0-0100 || 0000000
     = ver 1, id 6, 0 len type id, total len = 27, literal sub-packet, literal sub-packet, padding
     """
-    sub_packets: list[Packet] = field(default_factory=list, init=False)
+    data: bytes
+    bit_pos: int = 0
 
-    def __post_init__(self):
-        self.parse()
+    @classmethod
+    def from_hex(cls, hex_str: str) -> Message:
+        return cls(bytes.fromhex(hex_str.strip()))
 
     def __repr__(self) -> str:
-        return repr(f'Version: {self.version}, Sub-packets: {len(self.sub_packets)}')
-
-    def parse(self) -> None:
-        logging.debug(f'Parsing OperatorPacket (ver: {self.version}) with message ({len(self.message)}):\n'
-                      f'\t{self.message}')
-        length_type_id = self.message.read(1)
-        if length_type_id:
-            packet_number = self.message.read(11)
-            logging.debug(f'\tParsing {packet_number} sub-packets within length {len(self.message)}!\n'
-                          f'\t\t -> {self.message}')
-            while len(self.sub_packets) != packet_number:
-                self.sub_packets.append(self.message.parse())
-
-        else:
-            packet_length = self.message.read(15)
-            packet_bits = self.message.read_bits(packet_length)
-            new_message = Message(packet_bits)
-            logging.debug(f'\tParsing {packet_length} bits of sub-packets!\n'
-                          f'\t\t -> {packet_bits}')
-            while new_message.binary:
-                self.sub_packets.append(new_message.parse())
-
-    def get_value(self) -> int:
-        if self.type_id == 0:
-            return sum(packet.get_value() for packet in self.sub_packets)
-        if self.type_id == 1:
-            return reduce(mul, (packet.get_value() for packet in self.sub_packets))
-        if self.type_id == 2:
-            return min(packet.get_value() for packet in self.sub_packets)
-        if self.type_id == 3:
-            return max(packet.get_value() for packet in self.sub_packets)
-        if self.type_id == 5:
-            assert len(self.sub_packets) == 2
-            return self.sub_packets[0].get_value() > self.sub_packets[1].get_value()
-        if self.type_id == 6:
-            assert len(self.sub_packets) == 2
-            return self.sub_packets[0].get_value() < self.sub_packets[1].get_value()
-        if self.type_id == 7:
-            assert len(self.sub_packets) == 2
-            return self.sub_packets[0].get_value() == self.sub_packets[1].get_value()
-        raise ValueError(f'Unknown type ID: {self.type_id}')
-
-
-def hex_to_binary(hex_str: str) -> str:
-    data = bytes.fromhex(hex_str)
-    return ''.join(f'{b:08b}' for b in data)
+        return f'{int.from_bytes(self.data, "big"):0{len(self.data) * 8}b}'[self.bit_pos:]
+
+    def __len__(self) -> int:
+        """ Number of bits left to be read. """
+        return len(self.data) * 8 - self.bit_pos
+
+    def read(self, num_bits: int) -> int:
+        """ Read next `num_bits` bits as unsigned integer and move the cursor past them. """
+        byte_offset, bit_offset = divmod(self.bit_pos, 8)
+        byte_count = (bit_offset + num_bits + 7) // 8
+        chunk = int.from_bytes(self.data[byte_offset:byte_offset + byte_count], 'big')
+        self.bit_pos += num_bits
+        return (chunk >> (byte_count * 8 - bit_offset - num_bits)) & ((1 << num_bits) - 1)
+
+    def read_literal(self) -> int:
+        value = 0
+        while True:
+            # every group is 5 bits, the highest one tells if more groups follow
+            group = self.read(5)
+            value = (value << 4) | (group & 0xF)
+            if not group & 0x10:
+                break
+        return value
+
+    def evaluate(self) -> tuple[int, int]:
+        """
+        Parse outermost packet with all its sub-packets in one pass, returning its value and sum of all versions.
+        Operators whose sub-packets are still being read wait on explicit stack with values collected so far
+        together with the number of sub-packets or the bit position where they end.
+        """
+        version_sum = 0
+        operators: list[tuple[int, list[int], int | None, int | None]] = []
+        while True:
+            version = self.read(3)
+            type_id = self.read(3)
+            version_sum += version
+            logging.debug(f'Parsing packet (ver: {version}, type: {type_id}) at bit {self.bit_pos}.')
+
+            if type_id != LITERAL_TYPE_ID:
+                if self.read(1):
+                    operators.append((type_id, [], self.read(11), None))
+                else:
+                    packet_length = self.read(15)
+                    operators.append((type_id, [], None, self.bit_pos + packet_length))
+                continue
+
+            value = self.read_literal()
+            # hand value of finished packet to its operator, evaluating every operator that got all of its sub-packets
+            while operators:
+                type_id, values, packet_number, end_pos = operators[-1]
+                values.append(value)
+                if len(values) == packet_number or (end_pos is not None and self.bit_pos >= end_pos):
+                    operators.pop()
+                    value = OPERATIONS[type_id](values)
+                else:
+                    break
+            else:
+                return value, version_sum
 
 
 def parse_file(input_file: str) -> Message:
-    """ Parse input file for hexadecimal string and convert it to Packet. """
+    """ Parse input file for hexadecimal string and convert it to Message. """
     with open(input_file) as f:
         line = f.readline()
 
-    binary_str = hex_to_binary(line)
-    message = Message(binary_str)
-    return message
-
-
-def get_all_versions(packet: Packet) -> Iterator[int]:
-    if isinstance(packet, LiteralValuePacket):
-        yield packet.version
-    elif isinstance(packet, OperatorPacket):
-        yield packet.version
-        for sub_packet in packet.sub_packets:
-            yield from get_all_versions(sub_packet)
+    return Message.from_hex(line)
 
 
 # part 1
 def sum_versions(message: Message) -> int:
     """ Sum all versions parsed within packet and its sub-packets. """
-    sum_version = 0
-    packet = message.parse()
-    for version in get_all_versions(packet):
-        sum_version += version
-
-    return sum_version
+    _, version_sum = message.evaluate()
+    return version_sum
 
 
 @pytest.mark.parametrize(
@@ -217,14 +150,14 @@ def sum_versions(message: Message) -> int:
         ("A0016C880162017C3686B18A3D4780", 31)
     ])
 def test_parse_example(hex_str, expected):
-    assert expected == sum_versions(Message(hex_to_binary(hex_str)))
+    assert expected == sum_versions(Message.from_hex(hex_str))
 
 
-# part 1
+# part 2
 def calculate(message: Message) -> int:
     """ Calculate values parsed within packet and its sub-packets. """
-    packet = message.parse()
-    return packet.get_value()
+    value, _ = message.evaluate()
+    return value
 
 
 @pytest.mark.parametrize(
@@ -239,21 +172,17 @@ def calculate(message: Message) -> int:
         ("9C0141080250320F1802104A08", 1)
     ])
 def test_packet_calculation(hex_str, expected):
-    test = calculate(Message(hex_to_binary(hex_str)))
+    test = calculate(Message.from_hex(hex_str))
     assert expected == test
 
 
 if __name__ == "__main__":
     logging.basicConfig(stream=sys.stdout, level=logging.INFO)
 
+    # both parts are answered by single pass over the message
     start_time = timer()
-    total_sum = sum_versions(parse_file(INPUT_FILE))
+    total_result, total_sum = parse_file(INPUT_FILE).evaluate()
     end_time = timer()
     logging.info(f'({end_time - start_time:.4f}s elapsed) '
                  f'Total sum of all packet versions is {total_sum}.')
-
-    start_time = timer()
-    total_result = calculate(parse_file(INPUT_FILE))
-    end_time = timer()
-    logging.info(f'({end_time - start_time:.4f}s elapsed) '
-                 f'Total result of calculating all packets contained is {total_result}.')
+    logging.info(f'Total result of calculating all packets contained is {total_result}.')
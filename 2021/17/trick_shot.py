@@ -3,28 +3,21 @@
 from __future__ import annotations
 
 import logging
+import math
 import os
 import re
 import sys
-from collections import namedtuple, defaultdict
+from collections import namedtuple
 from dataclasses import dataclass, field
 from timeit import default_timer as timer
 
+import numpy as np
+
 INPUT_FILE = 'input.txt'
 INPUT_TEST = 'input_test.txt'
+REGEX = re.compile(r'x=([-\d]+)\.\.([-\d]+), y=([-\d]+)\.\.([-\d]+)')
 
 Point = namedtuple('Point', 'x y')
-Velocity = namedtuple('Velocity', 'x y')
-START_TRAJECTORY = Point(0, 0)
-
-
-def move_to_zero(x: int) -> int:
-    """ Move x coordinate to zero and return it. """
-    if x == 0:
-        return x
-    if x < 0:
-        return x + 1
-    return x - 1
 
 
 def sum_of_finite_series(distance) -> int:
@@ -32,17 +25,6 @@ def sum_of_finite_series(distance) -> int:
     return (distance * (distance + 1)) // 2
 
 
-def grow_trajectory(current_point: Point, current_velocity: Velocity) -> tuple[Point, Velocity]:
-    """ Grow trajectory according to given rules and return new point and velocity. """
-    # grow trajectory by velocity
-    new_point_x = current_point.x + current_velocity.x
-    new_point_y = current_point.y + current_velocity.y
-    # lessen velocity by drag and gravity
-    new_velocity_x = move_to_zero(current_velocity.x)
-    new_velocity_y = current_velocity.y - 1
-    return Point(new_point_x, new_point_y), Velocity(new_velocity_x, new_velocity_y)
-
-
 @dataclass
 class Grid:
     """ Class for describing grid with target area and possible trajectories generated within. """
@@ -50,55 +32,50 @@ class Grid:
     # target area definition
     target_min: Point = field(init=False)  # leftmost upper point of target area
     target_max: Point = field(init=False)  # rightmost lower point of target area
-    # all trajectories that have any point in target area defined above
-    trajectories: dict[Velocity, list[Point]] = field(default_factory=lambda: defaultdict(list), init=False)
+    vx_min: int = field(init=False)  # slowest x-velocity which does not stall before target area
+    # all starting velocities (x, y) whose trajectory has any point in target area defined above
+    velocities: np.ndarray = field(default_factory=lambda: np.empty((0, 2), dtype=np.int32), init=False)
 
     def __post_init__(self):
         x_coordinates, y_coordinates = self.coordinates
         self.target_min = Point(min(x_coordinates), min(y_coordinates))
         self.target_max = Point(max(x_coordinates), max(y_coordinates))
+        # x-velocity stalls after covering series(vx), the smallest vx with series(vx) >= target_min.x is taken
+        vx_min = (math.isqrt(8 * max(self.target_min.x, 0) + 1) - 1) // 2
+        if sum_of_finite_series(vx_min) < self.target_min.x:
+            vx_min += 1
+        self.vx_min = max(vx_min, 1)
+
+    def in_area_x(self, x: np.ndarray) -> np.ndarray:
+        """ Given x-coordinates are within target area. """
+        return (self.target_min.x <= x) & (x <= self.target_max.x)
 
-    def in_area_x(self, x: int) -> bool:
-        """ Given x-coordinate is within target area. """
-        return self.target_min.x <= x <= self.target_max.x
-
-    def in_area_y(self, y: int) -> bool:
-        """ Given y-coordinate is within target area. """
-        return self.target_min.y <= y <= self.target_max.y
-
-    def trajectory_in_area(self, trajectory: list[Point]) -> bool:
-        """ Return True if given trajectory is within target area. """
-        return any(self.in_area_x(point.x) and self.in_area_y(point.y) for point in trajectory)
-
-    def overshot(self, point: Point, velocity: Velocity) -> bool:
-        """ For given point and velocity decide if this overshoots target area with no chance of reaching it. """
-        # falling straight down and not within area x-coordinate
-        if velocity.x == 0 and not self.in_area_x(point.x):
-            return True
-        # still growing in both coordinates but beyond target area
-        if point.x > self.target_max.x or point.y < self.target_min.y:
-            return True
-        return False
-
-    def generate_trajectory(self, start_velocity: Velocity) -> list[Point]:
-        """ Generate trajectory for given velocity and return it. """
-        trajectory = []
-        curr_point = START_TRAJECTORY
-        curr_velocity = start_velocity
-        while not self.overshot(curr_point, curr_velocity):
-            trajectory.append(curr_point)
-            curr_point, curr_velocity = grow_trajectory(curr_point, current_velocity=curr_velocity)
-        return trajectory
+    def in_area_y(self, y: np.ndarray) -> np.ndarray:
+        """ Given y-coordinates are within target area. """
+        return (self.target_min.y <= y) & (y <= self.target_max.y)
 
     def find_trajectories(self):
-        """ Find all trajectories that go through target area and store them by their starting velocity. """
+        """
+        Find all starting velocities whose trajectory goes through target area.
+        Position after t steps has closed form and both coordinates are independent of each other:
+            x(t) = vx + (vx-1) + ... + max(vx-t+1, 0) = series(vx) - series(max(vx-t, 0))
+            y(t) = vy + (vy-1) + ... + (vy-t+1) = vy*t - series(t-1)
+        Velocity hits target area if there is a step t where both x(t) and y(t) are within it.
+        After 2*|target_min.y| + 1 steps even the highest shot falls below target area.
+        """
         assert self.target_min.y < 0
-        for x in range(1, self.target_max.x + 1):
-            for y in range(self.target_min.y, - self.target_min.y):
-                velocity = Velocity(x, y)
-                new_trajectory = self.generate_trajectory(velocity)
-                if self.trajectory_in_area(new_trajectory):
-                    self.trajectories[velocity] = new_trajectory
+        start_x = np.arange(self.vx_min, self.target_max.x + 1)
+        # highest shot comes back to y=0 with velocity -(vy+1), so vy + 1 must not overshoot target_min.y
+        start_y = np.arange(self.target_min.y, abs(self.target_min.y))
+        steps = np.arange(1, 2 * abs(self.target_min.y) + 2)
+
+        x = sum_of_finite_series(start_x[:, np.newaxis]) \
+            - sum_of_finite_series(np.maximum(start_x[:, np.newaxis] - steps, 0))
+        y = start_y[:, np.newaxis] * steps - sum_of_finite_series(steps - 1)
+        # (vx, vy) hits if its x and y rows are within target area at any common step
+        hit = (self.in_area_x(x).astype(np.int32) @ self.in_area_y(y).astype(np.int32).T) > 0
+        hit_x, hit_y = np.nonzero(hit)
+        self.velocities = np.column_stack((start_x[hit_x], start_y[hit_y]))
 
 
 def parse_file(input_file: str) -> tuple[tuple[int, int], tuple[int, int]]:
@@ -106,10 +83,8 @@ def parse_file(input_file: str) -> tuple[tuple[int, int], tuple[int, int]]:
     with open(input_file) as f:
         line = f.readline()
 
-    match = re.search(r'x=(?P<x1>[-\d]+)\.\.(?P<x2>[-\d]+), y=(?P<y1>[-\d]+)\.\.(?P<y2>[-\d]+)', line)
-    x_range = int(match.group('x1')), int(match.group('x2'))
-    y_range = int(match.group('y1')), int(match.group('y2'))
-    return x_range, y_range
+    x1, x2, y1, y2 = map(int, REGEX.search(line).groups())
+    return (x1, x2), (y1, y2)
 
 
 # part 1
@@ -140,7 +115,7 @@ def test_find_max_height():
 def count_all_velocities(grid: Grid) -> int:
     """ Generate valid trajectories hitting target area and return their count. """
     grid.find_trajectories()
-    return len(grid.trajectories)
+    return len(grid.velocities)
 
 
 def test_count_all_velocities():
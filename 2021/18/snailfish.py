@@ -5,14 +5,12 @@ from __future__ import annotations
 import logging
 import os
 import sys
-from copy import deepcopy
 from dataclasses import dataclass
 from functools import reduce
 from itertools import product
-from math import floor, ceil
 from operator import add
 from timeit import default_timer as timer
-from typing import Iterator
+from typing import Callable, TypeVar
 
 import pytest
 
@@ -22,169 +20,140 @@ INPUT_TEST = 'input_test.txt'
 VALUE_THRESHOLD = 10
 NESTED_TREE_LIMIT = 4
 
+T = TypeVar('T')
+
 
 @dataclass
 class Tree:
     """
-        Binary tree with in-order traversal (left to right) able to compute magnitude and add another tree.
-        Each node is in fact another tree, leaf is defined as having value and no left or right sub-tree.
-        Leave pair is such tree that had both children leaves.
+        Binary tree able to compute magnitude and add another tree.
+        Snailfish operations only ever need the order of leaves and how deep they are nested,
+        so tree is stored flat as values of its leaves in in-order traversal (left to right) and their depths.
+        Leaf pair is such sub-tree that has both children leaves, those are neighbours at the same depth.
     """
-    level: int
-    parent: Tree | None
-    value: int | None
-    left: Tree | None
-    right: Tree | None
+    values: list[int]
+    depths: list[int]
 
     def __repr__(self) -> str:
-        if self.is_leaf():
-            return f'{self.value}'
-        return f'[{repr(self.left)}, {repr(self.right)}]'
-
-    def __eq__(self, other: Tree) -> bool:
-        return self.value == other.value and \
-               self.level == other.level and \
-               self.left == other.left and \
-               self.right == other.right
+        return self._fold(str, lambda left, right: f'[{left}, {right}]')
 
     def __add__(self, other_tree: Tree) -> Tree:
-        left = deepcopy(self)
-        right = deepcopy(other_tree)
-        tree = Tree(level=0, parent=None, value=None, left=left, right=right)
-        left.re_root(tree)
-        right.re_root(tree)
+        tree = Tree(values=self.values + other_tree.values,
+                    depths=[depth + 1 for depth in self.depths + other_tree.depths])
         tree.reduce()
         return tree
 
     @property
     def magnitude(self) -> int:
-        if self.is_leaf():
-            return self.value
-        return 3 * self.left.magnitude + 2 * self.right.magnitude
+        return self._fold(int, lambda left, right: 3 * left + 2 * right)
 
     @classmethod
     def parse(cls, tree_def: list[list | int]) -> Tree:
-        return cls.create_tree(parent=None, level=0, tree_def=tree_def)
+        tree = cls(values=[], depths=[])
+        tree.add_leaves(level=0, tree_def=tree_def)
+        return tree
 
     @classmethod
-    def create_tree(cls, parent: Tree | None, level: int, tree_def: list | int) -> Tree:
-        if isinstance(tree_def, int):
-            return cls(level=level, parent=parent, value=tree_def, left=None, right=None)
-        left, right = tree_def
-        tree = cls(level=level, parent=parent, value=None, left=None, right=None)
-        tree.left = cls.create_tree(parent=tree, level=level + 1, tree_def=left)
-        tree.right = cls.create_tree(parent=tree, level=level + 1, tree_def=right)
+    def parse_line(cls, line: str) -> Tree:
+        """ Parse tree written as nested lists directly into leaves, depth is number of currently open brackets. """
+        tree = cls(values=[], depths=[])
+        level = 0
+        value = None
+        for char in line:
+            if char.isdigit():
+                value = (value or 0) * 10 + int(char)
+                continue
+            if value is not None:
+                tree.values.append(value)
+                tree.depths.append(level)
+                value = None
+            if char == '[':
+                level += 1
+            elif char == ']':
+                level -= 1
         return tree
 
-    def re_root(self, parent: Tree) -> None:
-        """ Add another level above root tree and recalculate levels to reflect this.  """
-        assert self.is_root()
-        self.parent = parent
-        self._add_level()
-
-    def _add_level(self) -> None:
-        self.level += 1
-        if not self.is_leaf():
-            self.left._add_level()
-            self.right._add_level()
-
-    def all_leaves(self) -> Iterator[Tree]:
-        """ Generate all leaves in in-order traversal (left to right). """
-        if self.is_leaf():
-            yield self
-        else:
-            yield from self.left.all_leaves()
-            yield from self.right.all_leaves()
-
-    def all_leaf_pairs(self) -> Iterator[Tree]:
-        """ Generate all leaf pairs in in-order traversal (left to right). """
-        if self.is_leaf():
+    def add_leaves(self, level: int, tree_def: list | int) -> None:
+        if isinstance(tree_def, int):
+            self.values.append(tree_def)
+            self.depths.append(level)
             return
-        if self.is_leaf_pair():
-            yield self
-        else:
-            yield from self.left.all_leaf_pairs()
-            yield from self.right.all_leaf_pairs()
-
-    def is_leaf(self) -> bool:
-        return self.value is not None and self.left is None and self.right is None
-
-    def is_leaf_pair(self) -> bool:
-        return not self.is_leaf() and self.left.is_leaf() and self.right.is_leaf()
-
-    def is_root(self) -> bool:
-        return self.parent is None
-
-    def get_root(self) -> Tree:
-        if self.is_root():
-            return self
-        return self.parent.get_root()
-
-    def is_left(self) -> bool:
-        return not self.is_root() and self is self.parent.left
-
-    def is_right(self) -> bool:
-        return not self.is_root() and self is self.parent.right
-
-    def get_deep_nested_pair(self, limit: int = NESTED_TREE_LIMIT) -> Tree | None:
-        """ Get leftmost pair that is nested exactly NESTED_TREE_LIMIT deep. """
-        for pair in self.all_leaf_pairs():
-            if pair.level == limit:
-                return pair
+        left, right = tree_def
+        self.add_leaves(level=level + 1, tree_def=left)
+        self.add_leaves(level=level + 1, tree_def=right)
+
+    def _fold(self, leaf: Callable[[int], T], pair: Callable[[T, T], T]) -> T:
+        """ Rebuild tree bottom-up, merging two neighbours on top of stack whenever they are at the same depth. """
+        stack: list[tuple[T, int]] = []
+        for value, depth in zip(self.values, self.depths):
+            item = leaf(value)
+            while stack and stack[-1][1] == depth:
+                left, _ = stack.pop()
+                item = pair(left, item)
+                depth -= 1
+            stack.append((item, depth))
+        assert len(stack) == 1
+        return stack[0][0]
+
+    def get_deep_nested_pair(self, limit: int = NESTED_TREE_LIMIT) -> int | None:
+        """ Get index of left child of leftmost pair that is nested exactly NESTED_TREE_LIMIT deep. """
+        for index, depth in enumerate(self.depths):
+            if depth > limit:
+                return index
         return None
 
-    def get_leaf_above_threshold(self, threshold: int = VALUE_THRESHOLD) -> Tree | None:
-        """ Get leftmost leaf which has value larger or equal to VALUE_THRESHOLD """
-        for leaf in self.all_leaves():
-            if leaf.value >= threshold:
-                return leaf
+    def get_leaf_above_threshold(self, threshold: int = VALUE_THRESHOLD) -> int | None:
+        """ Get index of leftmost leaf which has value larger or equal to VALUE_THRESHOLD """
+        for index, value in enumerate(self.values):
+            if value >= threshold:
+                return index
         return None
 
     def reduce(self) -> None:
-        """ Reduce tree by one of actions in this order: Explode too deep nested pairs and split big leaves.  """
-        while True:
-            if deep_pair := self.get_deep_nested_pair():
-                deep_pair.explode()
-                continue
-            if big_leaf := self.get_leaf_above_threshold():
-                big_leaf.split()
+        """
+            Reduce tree by one of actions in this order: Explode too deep nested pairs and split big leaves.
+            Both are done in single left to right sweep each, instead of searching from the start after every action:
+                - exploding never nests anything deeper, so all too deep pairs can be exploded in one pass
+                - leaves left of the leftmost big leaf are all small, only exploding the pair split from it
+                  can raise its left neighbour, so the search continues from there
+        """
+        index = 0
+        while index < len(self.values):
+            if self.depths[index] > NESTED_TREE_LIMIT:
+                self.explode(index)
+            index += 1
+
+        index = 0
+        while index < len(self.values):
+            if self.values[index] < VALUE_THRESHOLD:
+                index += 1
                 continue
-            break
+            self.split(index)
+            if self.depths[index] > NESTED_TREE_LIMIT:
+                self.explode(index)
+                index = max(index - 1, 0)
 
-    def explode(self):
+    def explode(self, index: int) -> None:
         """
-            Transform current leaf pair:
+            Transform leaf pair whose left child is at given index:
                 - add its left child value to the nearest left leaf
                 - add its right child value to the nearest right leaf
                 - transforming leaf pair to leaf and setting it's value to 0.
-            This is done by using our implementation of in-order traversal to generate all leaves.
-
         """
-        assert self.is_leaf_pair()
-        # remember previous leaf to be able to access it once we get to the left child
-        prev_leaf = None
-        for leaf in self.get_root().all_leaves():
-            if leaf is self.left:
-                if prev_leaf:
-                    prev_leaf.value += self.left.value
-            # here check that prev_leaf is our right child to be able to easily access next node to the right as leaf
-            elif prev_leaf is self.right:
-                leaf.value += self.right.value
-                break
-            prev_leaf = leaf
-        # once we are done exploding values to the left and to the right, reset tree to be a leaf with zero value
-        self.left = None
-        self.right = None
-        self.value = 0
-        assert self.is_leaf()
-
-    def split(self):
-        """ Split current leaf into leaf pair such that their value add to the original value. """
-        assert self.is_leaf()
-        self.left = self.create_tree(parent=self, level=self.level + 1, tree_def=floor(self.value / 2))
-        self.right = self.create_tree(parent=self, level=self.level + 1, tree_def=ceil(self.value / 2))
-        self.value = None
-        assert self.is_leaf_pair()
+        depth = self.depths[index]
+        assert self.depths[index + 1] == depth
+        if index > 0:
+            self.values[index - 1] += self.values[index]
+        if index + 2 < len(self.values):
+            self.values[index + 2] += self.values[index + 1]
+        self.values[index:index + 2] = [0]
+        self.depths[index:index + 2] = [depth - 1]
+
+    def split(self, index: int) -> None:
+        """ Split leaf at given index into leaf pair such that their value add to the original value. """
+        value = self.values[index]
+        self.values[index:index + 1] = [value // 2, (value + 1) // 2]
+        self.depths[index:index + 1] = [self.depths[index] + 1] * 2
 
 
 def parse_file(input_file: str) -> list[Tree]:
@@ -192,8 +161,8 @@ def parse_file(input_file: str) -> list[Tree]:
     parsed_trees = []
     with open(input_file) as f:
         for line in f:
-            tree_def = eval(line.strip())
-            parsed_trees.append(Tree.parse(tree_def))
+            if line.strip():
+                parsed_trees.append(Tree.parse_line(line))
     return parsed_trees
 
 
@@ -226,6 +195,16 @@ def test_find_largest_magnitude():
     assert test_magnitude == 3993
 
 
+@pytest.mark.parametrize(
+    "tree_def", [
+        [9, 1],
+        [[1, 2], [[3, 4], 5]],
+        [[[[0, 7], 4], [15, [0, 13]]], [1, 1]],
+    ])
+def test_parse_line(tree_def):
+    assert Tree.parse_line(str(tree_def)) == Tree.parse(tree_def)
+
+
 def test_addition():
     assert (Tree.parse([[[[4, 3], 4], 4], [7, [[8, 4], 9]]]) + Tree.parse([1, 1])) == \
            Tree.parse([[[[0, 7], 4], [[7, 8], [6, 0]]], [8, 1]])
@@ -233,7 +212,7 @@ def test_addition():
 
 def test_split():
     tree = Tree.parse([[[[0, 7], 4], [15, [0, 13]]], [1, 1]])
-    tree.get_leaf_above_threshold().split()
+    tree.split(tree.get_leaf_above_threshold())
     assert tree == Tree.parse([[[[0, 7], 4], [[7, 8], [0, 13]]], [1, 1]])
 
 
@@ -247,7 +226,7 @@ def test_split():
     ])
 def test_explode(tree_def, expected):
     tree = Tree.parse(tree_def)
-    tree.get_deep_nested_pair().explode()
+    tree.explode(tree.get_deep_nested_pair())
     assert tree == Tree.parse(expected)
 
 
@@ -4,18 +4,25 @@ from __future__ import annotations
 
 import itertools
 import logging
+import math
 import os
 import sys
-from collections import namedtuple, defaultdict
+from collections import namedtuple, deque
 from dataclasses import dataclass, field
 from itertools import combinations
 from timeit import default_timer as timer
 from typing import Iterator, NamedTuple
 
+import numpy as np
+
 INPUT_FILE = 'input.txt'
 INPUT_TEST = 'input_test.txt'
 
 MIN_OVERLAP = 12
+# overlapping beacons share at least this many distances between their pairs
+MIN_OVERLAP_DISTANCES = math.comb(MIN_OVERLAP, 2)
+# bits reserved for each coordinate when packed into single int, coordinate differences must fit into +-2**20
+COORDINATE_BITS = 21
 
 #  Sign and index of Rotation axis that is being rotated. Axis: x=0, y=1, z=2
 Pair = namedtuple('Pair', 'sign axis')
@@ -34,25 +41,10 @@ class Point(NamedTuple):
     y: int
     z: int
 
-    def __sub__(self, other: Point) -> Point:
-        """ Calculate difference (shift) of two points.  """
-        return Point(self.x - other.x, self.y - other.y, self.z - other.z)
-
-    def __add__(self, other) -> Point:
-        """ Calculate sum of two Points (shifting of original). """
-        return Point(self.x + other.x, self.y + other.y, self.z + other.z)
-
     def manhattan_distance(self, other: Point) -> int:
         """ Calculate Manhattan Distance to another point. """
         return abs(self.x - other.x) + abs(self.y - other.y) + abs(self.z - other.z)
 
-    def rotate(self, rotation: Rotation) -> Point:
-        """ Rotate the point in any axis. """
-        if rotation == Rotation(Pair(1, 0), Pair(1, 1), Pair(1, 2)):
-            # identity, no rotation needed
-            return self
-        return Point(*tuple(pair.sign * self[pair.axis] for pair in rotation))
-
 
 @dataclass
 class Grid:
@@ -60,56 +52,58 @@ class Grid:
         Grid represents continuous area scanned by Scanner from Point(0,0,0) storing all beacons it found.
         Each grid can be fixed (matched to another grid) by rotation and shift.
         Grid overlap can be efficiently found by comparing set of all distances between all pairs of beacons.
+        Squared euclidean distances are used as they do not change with any rotation or shift of the grid.
     """
     beacons: set[Point]
     fixed: bool = False
     idx: int = field(default_factory=itertools.count().__next__, init=False)
-    distances: dict[tuple[Point, Point], int] = field(default_factory=dict, init=False)
+    distances: frozenset[int] = field(default_factory=frozenset, init=False)
+    beacons_arr: np.ndarray = field(init=False)  # the same beacons as (M, 3) array of x,y,z coordinates
 
     def __post_init__(self) -> None:
-        """ Calculate manhattan distances between all points stored on grid. """
-        for beacon, other in combinations(self.beacons, 2):
-            self.distances[beacon, other] = beacon.manhattan_distance(other)
-
-    def rotate(self, rotation: Rotation) -> Grid:
-        """ Return copy of Grid rotated by given rotation. """
-        if rotation == Rotation(Pair(1, 0), Pair(1, 1), Pair(1, 2)):
-            return self
-        rotated_beacons = {beacon.rotate(rotation) for beacon in self.beacons}
-        return Grid(rotated_beacons)
-
-    def shift(self, shift: Point) -> Grid:
-        """ Return copy of Grid shifted by given shift. """
-        if shift == Point(0, 0, 0):
-            return self
-        shifted = {beacon + shift for beacon in self.beacons}
-        return Grid(shifted)
+        """ Calculate squared euclidean distances between all pairs of beacons stored on grid. """
+        self.beacons_arr = np.array(list(self.beacons), dtype=np.int32).reshape(-1, 3)
+        diffs = self.beacons_arr[:, np.newaxis].astype(np.int64) - self.beacons_arr[np.newaxis]
+        squared = (diffs * diffs).sum(axis=2)
+        self.distances = frozenset(squared[np.triu_indices(len(self.beacons_arr), k=1)].tolist())
 
     def overlaps(self, other: Grid) -> bool:
         """ If grid overlaps with another in at least 12 beacons. """
-        overlap = set(self.distances.values()) & set(other.distances.values())
-        return len(overlap) >= len(list(combinations(range(MIN_OVERLAP), 2)))
+        overlap = self.distances & other.distances
+        return len(overlap) >= MIN_OVERLAP_DISTANCES
 
     def match_grid(self, other: Grid) -> Point:
         """ Rotate and shift given grid based on its overlap so both are fixed in same starting position. """
         assert self.fixed is True
         if other.fixed:
             return Point(0, 0, 0)
-        # try all pairs of beacons to find identity after rotation
-        for beacon in self.beacons:
-            for other_beacon in other.beacons:
-                for rotation in generate_rotations():
-                    shift = beacon - other_beacon.rotate(rotation)
-                    candidate = other.rotate(rotation).shift(shift)
-                    overlap = self.beacons & candidate.beacons
-                    if len(overlap) >= MIN_OVERLAP:
-                        other.beacons = candidate.beacons
-                        other.fixed = True
-                        logging.debug(f'Scanner {self.idx} matched to {other.idx} at {shift}.')
-                        return shift
+        # all 24 rotations of other grid at once, shape (rotation, beacon, axis)
+        rotated_grids = other.beacons_arr[:, ROTATION_AXES].transpose(1, 0, 2) * ROTATION_SIGNS[:, np.newaxis]
+        codes = encode_points(self.beacons_arr)
+        for rotated in rotated_grids:
+            # every pair of beacons votes for shift which would put them on top of each other
+            shifts = (codes[:, np.newaxis] - encode_points(rotated)[np.newaxis]).ravel()
+            votes, first_idx, counts = np.unique(shifts, return_index=True, return_counts=True)
+            best = counts.argmax()
+            if counts[best] >= MIN_OVERLAP:
+                beacon_idx, other_idx = divmod(int(first_idx[best]), len(rotated))
+                shift_arr = self.beacons_arr[beacon_idx] - rotated[other_idx]
+                candidate = rotated + shift_arr
+                shift = Point(*shift_arr.tolist())
+                other.beacons = set(map(Point._make, candidate.tolist()))
+                other.beacons_arr = candidate
+                other.fixed = True
+                logging.debug(f'Scanner {self.idx} matched to {other.idx} at {shift}.')
+                return shift
         raise ValueError('No overlap found, but there should be!')
 
 
+def encode_points(points: np.ndarray) -> np.ndarray:
+    """ Pack (M, 3) array of x,y,z coordinates into (M,) array of ints, difference of codes encodes the shift. """
+    points = points.astype(np.int64)
+    return (points[:, 0] << 2 * COORDINATE_BITS) + (points[:, 1] << COORDINATE_BITS) + points[:, 2]
+
+
 def generate_rotations() -> Iterator[Rotation]:
     """ Generate all rotations in 90 degree turns along any axis. """
     rotation_definitions = [
@@ -124,6 +118,11 @@ def generate_rotations() -> Iterator[Rotation]:
         yield Rotation(*pairs)
 
 
+# all 24 rotations as (24, 3) arrays of original axis and sign for each rotated axis
+ROTATION_AXES = np.array([[pair.axis for pair in rotation] for rotation in generate_rotations()], dtype=np.intp)
+ROTATION_SIGNS = np.array([[pair.sign for pair in rotation] for rotation in generate_rotations()], dtype=np.int32)
+
+
 def parse_file(input_file: str) -> list[Grid]:
     """ Parse given file into list of scanned Grids. """
     grids = []
@@ -147,31 +146,21 @@ def parse_file(input_file: str) -> list[Grid]:
 # part 1 & 2
 def calculate_beacons(scanners: list[Grid]) -> tuple[int, list[Point]]:
     """ Match/fix all scanned grids to the same grid to find total count of beacons. """
-    scanner: Grid
-    other_scanner: Grid
-    overlaps = defaultdict(list)
-    for scanner, other_scanner in combinations(scanners, 2):
-        if scanner.overlaps(other_scanner):
-            overlaps[scanner.idx].append(other_scanner.idx)
-            overlaps[other_scanner.idx].append(scanner.idx)
-
     found_shifts = []
     start_idx = 0
-    queue = [start_idx]
+    queue = deque([start_idx])
     scanners[start_idx].fixed = True
     while queue:
         # grid from queue that is already fixed
-        idx = queue.pop(start_idx)
-        # for all the other grids that overlap with it
-        for other_idx in overlaps[idx]:
-            # skip the grid that is already fixed
-            if scanners[other_idx].fixed:
+        scanner = scanners[queue.popleft()]
+        # overlaps are only checked against grids not fixed yet, pairs of fixed grids need no matching
+        for other_idx, other_scanner in enumerate(scanners):
+            if other_scanner.fixed or not scanner.overlaps(other_scanner):
                 continue
             # find shift needed to match the grid
-            found_shifts.append(scanners[idx].match_grid(scanners[other_idx]))
-            # add the grid to the queue to fix its overlapping grids too
-            if other_idx not in queue:
-                queue.append(other_idx)
+            found_shifts.append(scanner.match_grid(other_scanner))
+            # add the grid to the queue to fix its overlapping grids too, it is fixed now so it is never added twice
+            queue.append(other_idx)
     # merge all found beacons in fixed grids to find their sum
     all_beacons = set()
     for scanner in scanners:
@@ -2,18 +2,22 @@
 
 from __future__ import annotations
 
+import itertools
 import logging
 import os
 import sys
 from dataclasses import dataclass
-from functools import cache
 from timeit import default_timer as timer
 
+import numpy as np
+
 INPUT_FILE = 'input.txt'
 INPUT_TEST = 'input_test.txt'
 
 NUM_ROLLS = 3
 BOARD_POSITIONS = 10
+# score needed to win quantum dice
+QUANTUM_SCORE = 21
 # all 27 possible universes where 3-sided dice was rolled three times, grouped to 7 sums by total score in them
 # Counter(sum(elem) for elem in itertools.product(range(1, 4), repeat=NUM_ROLLS))
 ROLL_SUMS = {3: 1, 4: 3, 5: 6, 6: 7, 7: 6, 8: 3, 9: 1}
@@ -33,19 +37,6 @@ def parse_file(input_file: str) -> tuple[int, int]:
     return int(player_1), int(player_2)
 
 
-@dataclass
-class Dice:
-    """ Deterministic dice generating 1,2,3, ... ,100 and then starting from the beginning. """
-    sides: int = 100
-    position: int = 1
-
-    @classmethod
-    def roll(cls) -> int:
-        old_position = cls.position
-        cls.position = wrap_number(number=cls.position, increment=1, maximum=cls.sides)
-        return old_position
-
-
 @dataclass
 class Player:
     """
@@ -55,10 +46,7 @@ class Player:
     position: int
     score: int = 0
 
-    def move(self):
-        forward = 0
-        for _ in range(NUM_ROLLS):
-            forward += Dice.roll()
+    def move(self, forward: int):
         self.position = wrap_number(number=self.position, increment=forward)
         self.score += self.position
 
@@ -68,14 +56,17 @@ class Player:
 
 # part 1
 def play_deterministic_dice(players: tuple[Player, Player], max_score: int = 1000) -> tuple[int, int]:
-    """ Play deterministic dice for two players until one of them reaches 1000 score. """
-    counter = 0
-    while True:
-        for idx, player in enumerate(players):
-            player.move()
-            counter += NUM_ROLLS
-            if player.wins(max_score):
-                return counter, players[0 if idx else 1].score
+    """
+        Play deterministic dice for two players until one of them reaches 1000 score.
+        Deterministic dice generates 1,2,3, ... ,100 and then starts from the beginning, so on turn t
+        it rolls 3t+1, 3t+2, 3t+3 summing to 9t+6. Wrapping dice at 100 changes the sum only by multiples
+        of board size and does not change where player lands.
+    """
+    for turn in itertools.count():
+        player = players[turn % 2]
+        player.move(9 * turn + 6)
+        if player.wins(max_score):
+            return (turn + 1) * NUM_ROLLS, players[(turn + 1) % 2].score
 
 
 def test_play():
@@ -86,34 +77,42 @@ def test_play():
 
 
 # part 2
-@cache
 def play_quantum_dice(position_1: int, position_2: int, score_1: int, score_2: int) -> tuple[int, int]:
     """
-        Cached recursive function to play quantum dice.
+        Play quantum dice from given state and count universes in which each player wins.
         Each time player moves, they roll three times. Each roll splits universes to three where player rolled 1,2,3.
         Thus, on each move, 27 universes are created, but are grouped to 7 by their total score and count.
+        Wins are counted bottom-up for all states (score_1, score_2, position_1, position_2) where player 1 moves,
+        from the highest total score down, as every move leads to a state with higher total score.
     """
-    # atomic scenario within the deepest recursion where it is decided, which player wins this universe
-    if score_1 >= 21:
+    # atomic scenario where it is decided, which player wins this universe
+    if score_1 >= QUANTUM_SCORE:
         return 1, 0
-    if score_2 >= 21:
+    if score_2 >= QUANTUM_SCORE:
         return 0, 1
-
-    total_player_1_wins = 0
-    total_player_2_wins = 0
-
-    # each of universe group, containing dirac roll sum and how many universes they contain, splits current status
-    for roll_sum, count in ROLL_SUMS.items():
-        # compute new position and score for player in position 1
-        new_position = wrap_number(position_1, roll_sum)
-        new_score = score_1 + new_position
-        # store result and swap position to player 2 to play his turn
-        player_2_wins, player_1_wins = play_quantum_dice(position_2, new_position, score_2, new_score)
-        # to determine total universes in which the player won, their total wins must be multiplied by initial count
-        total_player_1_wins += player_1_wins * count
-        total_player_2_wins += player_2_wins * count
-
-    return total_player_1_wins, total_player_2_wins
+    # wins of (player 1, player 2) for each state, positions are indexed from 0
+    wins = np.zeros((QUANTUM_SCORE, QUANTUM_SCORE, BOARD_POSITIONS, BOARD_POSITIONS, 2), dtype=np.int64)
+    positions = np.arange(BOARD_POSITIONS)
+    for total_score in range(2 * QUANTUM_SCORE - 2, -1, -1):
+        # all states with the same total score are independent of each other and are counted at once
+        current_scores = np.arange(max(0, total_score - QUANTUM_SCORE + 1), min(total_score, QUANTUM_SCORE - 1) + 1)
+        other_scores = total_score - current_scores
+        # wins for all scores and positions of both players, shape (score, position_1, position_2, 2)
+        current = np.zeros((len(current_scores), BOARD_POSITIONS, BOARD_POSITIONS, 2), dtype=np.int64)
+        # each of universe group, containing dirac roll sum and how many universes they contain, splits the states
+        for roll_sum, count in ROLL_SUMS.items():
+            new_positions = (positions + roll_sum) % BOARD_POSITIONS
+            new_scores = current_scores[:, np.newaxis] + new_positions + 1
+            # player 1 wins all universes of this group right away
+            won = new_scores >= QUANTUM_SCORE
+            current[..., 0] += count * won[..., np.newaxis]
+            # otherwise it is player 2's turn, so their wins are swapped and multiplied by group count
+            next_wins = wins[other_scores[:, np.newaxis], np.minimum(new_scores, QUANTUM_SCORE - 1), :, new_positions]
+            current += count * ~won[..., np.newaxis, np.newaxis] * next_wins[..., ::-1]
+        wins[current_scores, other_scores] = current
+
+    player_1_wins, player_2_wins = wins[score_1, score_2, position_1 - 1, position_2 - 1].tolist()
+    return player_1_wins, player_2_wins
 
 
 def test_play_quantum_dice():
@@ -7,183 +7,56 @@ import os
 import re
 import sys
 from dataclasses import dataclass, field
-from itertools import product
 from timeit import default_timer as timer
-from typing import Iterator, NamedTuple, Any
+
+import numpy as np
+import pytest
 
 INPUT_FILE = 'input.txt'
 INPUT_TEST = 'input_test.txt'
 INPUT_TEST2 = 'input_test2.txt'
-REGEX = r'x=(?P<x1>[-\d]+)\.\.(?P<x2>[-\d]+),y=(?P<y1>[-\d]+)\.\.(?P<y2>[-\d]+),z=(?P<z1>[-\d]+)\.\.(?P<z2>[-\d]+)'
+# range of each axis on which cubes are switched in part 1
+LIMIT = (-50, 50)
+REGEX = re.compile(
+    r'^[ \t]*(on|off) x=([-\d]+)\.\.([-\d]+),y=([-\d]+)\.\.([-\d]+),z=([-\d]+)\.\.([-\d]+)[ \t]*$', re.MULTILINE
+)
 
 
-class Voxel(NamedTuple):
-    x: int
-    y: int
-    z: int
+# cuboid is defined by min and max (both included) of each axis: (x_min, x_max, y_min, y_max, z_min, z_max)
+Cuboid = tuple[int, int, int, int, int, int]
 
 
-@dataclass(frozen=True)
-class Range:
+@dataclass
+class EfficientGrid:
     """
-        Class implementing distance from min to max (both included).
-        Has ability to detect overlapping with another and to split by intersection.
+        Efficient grid storing signed cuboids, where lit voxels are counted by inclusion-exclusion of their volumes.
+        Each voxel is within the stored cuboids with total sign 1 if it is lit and 0 otherwise.
+        Cuboids are stored as arrays of their (x, y, z) minimums and maximums, so they can be intersected at once.
     """
-    min: int
-    max: int
-
-    def __post_init__(self):
-        assert self.min <= self.max, 'First parameter of range must be lower or equal to the second one.'
-
-    def __len__(self):
-        """ Length of range. """
-        return self.max - self.min + 1
-
-    def __eq__(self, other: Range) -> bool:
-        return self.min == other.min and self.max == other.max
-
-    def __iter__(self) -> Iterator[Range]:
-        yield self.min
-        yield self.max
-
-    def __contains__(self, other: Any) -> bool:
-        if isinstance(other, int):
-            return self.min <= other <= self.max
-        if isinstance(other, Range):
-            if self == other:
-                return True
-            return other.min in self and other.max in self
-        raise NotImplementedError
-
-    def overlaps(self, other: Range) -> bool:
-        return self.max >= other.min and self.min <= other.max
-
-    def get_intersection(self, other: Range) -> Range | None:
-        if self == other:
-            return self
-        new_range_min, new_range_max = max(self.min, other.min), min(self.max, other.max)
-        if new_range_min > new_range_max:
-            # no intersection
-            return None
-        return Range(new_range_min, new_range_max)
-
-    def split(self, item: Any) -> list[Range]:
-        """ Split range by intersection with another range. """
-        if isinstance(item, Range):
-            if self == item:
-                return [self]
-            intersection = self.get_intersection(item)
-            assert intersection is not None, "Cannot split range if it doesn't have intersection with the other."
-            if self.min == intersection.min:
-                return [intersection, Range(intersection.max + 1, self.max)]
-            if self.max == intersection.max:
-                return [Range(self.min, intersection.min - 1), intersection]
-            # intersection is within self
-            return [Range(self.min, intersection.min - 1), intersection, Range(intersection.max + 1, self.max)]
-        raise NotImplementedError
-
-
-class Cuboid(NamedTuple):
-    x: Range
-    y: Range
-    z: Range
-
-    def __len__(self):
-        """ Volume of cuboid. """
-        return len(self.x) * len(self.y) * len(self.z)
-
-    def __eq__(self, other):
-        return self.x == other.x and self.y == other.y and self.z == other.z
-
-    def __contains__(self, item: Any) -> bool:
-        if isinstance(item, (Cuboid, Voxel)):
-            return item.x in self.x and item.y in self.y and item.z in self.z
-        raise NotImplementedError
-
-    def overlaps(self, other: Cuboid) -> bool:
-        if self == other:
-            return True
-        return all(axis.overlaps(other_axis) for axis, other_axis in zip(self, other))
-
-    def get_intersection(self, other: Cuboid) -> Cuboid | None:
-        if self == other:
-            return self
-        ranges = []
-        for axis, other_axis in zip(self, other):
-            axis_intersection = axis.get_intersection(other_axis)
-            if axis_intersection is None:
-                return None
-            ranges.append(axis_intersection)
-        return Cuboid(*ranges)
-
-    def extract(self, other: Cuboid) -> set[Cuboid]:
-        """ Split self, extract intersection with another cuboid and return rest of sub-cuboids. """
-        new_cuboids = set()
-        if self == other:
-            return set()
-        intersection = self.get_intersection(other)
-        assert intersection is not None, "Cannot split cuboid if it doesn't have intersection with the other."
-        split_ranges = []
-        for axis, other_axis in zip(self, intersection):
-            split_ranges.append(axis.split(other_axis))
-        for x, y, z in product(*split_ranges):
-            new_cuboid = Cuboid(x, y, z)
-            if new_cuboid != intersection:
-                new_cuboids.add(new_cuboid)
-        logging.debug(f'Splitting into {len(new_cuboids)} new cuboids.'
-                      f'\nThrowing away {intersection}.')
-        return new_cuboids
+    _mins: np.ndarray = field(default_factory=lambda: np.empty((0, 3), dtype=np.int64), init=False)
+    _maxs: np.ndarray = field(default_factory=lambda: np.empty((0, 3), dtype=np.int64), init=False)
+    _signs: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64), init=False)
 
-
-@dataclass
-class EfficientGrid:
-    """ Efficient grid with ability to store all non-overlapping lit cuboids within by their range definition. """
-    _lit_cuboids: set[Cuboid] = field(default_factory=set, init=False)
+    def _append(self, mins: np.ndarray, maxs: np.ndarray, signs: np.ndarray) -> None:
+        self._mins = np.concatenate((self._mins, mins))
+        self._maxs = np.concatenate((self._maxs, maxs))
+        self._signs = np.concatenate((self._signs, signs))
 
     def add_lit(self, cuboid: Cuboid) -> None:
-        """ Add lit cuboid. If it overlaps with one already stored, split it, extract intersection and add the rest. """
-        queue = [cuboid]
-        lit_to_remove = set()
-        lit_to_add = set()
-        while queue:
-            new_cuboid = queue.pop()
-            for lit_cuboid in self._lit_cuboids:
-                if new_cuboid in lit_cuboid:
-                    # cuboid is already lit, move to another in queue
-                    break
-                if lit_cuboid in new_cuboid:
-                    # new cuboid is around lit cuboid, so replace it and search the rest
-                    lit_to_remove.add(lit_cuboid)
-                elif new_cuboid.overlaps(lit_cuboid):
-                    # new cuboid overlaps with some lit cuboid, so split it, extract intersections and add the rest
-                    new_cuboids = new_cuboid.extract(lit_cuboid)
-                    queue.extend(new_cuboids)
-                    break
-            else:
-                # run this if we didn't break from for cycle or skipped it due to no members
-                lit_to_add.add(new_cuboid)
-            self._lit_cuboids = self._lit_cuboids - lit_to_remove
-            self._lit_cuboids |= lit_to_add
+        """ Add lit cuboid. Clear it first so voxels which are already lit are not counted twice. """
+        self.remove_lit(cuboid)
+        self._append(np.array([cuboid[0::2]]), np.array([cuboid[1::2]]), np.ones(1, dtype=np.int64))
 
     def remove_lit(self, cuboid: Cuboid) -> None:
-        """ Remove cuboid from lit cuboids. If it overlaps with existing one, split it to remove intersection. """
-        lit_to_remove = set()
-        lit_to_add = set()
-        for lit_cuboid in self._lit_cuboids:
-            if lit_cuboid in cuboid:
-                # remove lit cuboids if they are same or smaller size
-                lit_to_remove.add(lit_cuboid)
-            elif cuboid.overlaps(lit_cuboid):
-                # new cuboid overlaps with lit cuboid, so split the lit one and remove intersection
-                new_lit_cuboids = lit_cuboid.extract(cuboid)
-                lit_to_remove.add(lit_cuboid)
-                lit_to_add |= new_lit_cuboids
-        self._lit_cuboids = self._lit_cuboids - lit_to_remove
-        self._lit_cuboids |= lit_to_add
+        """ Remove cuboid from lit voxels. Intersection with each stored cuboid is stored with opposite sign. """
+        mins = np.maximum(self._mins, cuboid[0::2])
+        maxs = np.minimum(self._maxs, cuboid[1::2])
+        overlapping = (mins <= maxs).all(axis=1)
+        self._append(mins[overlapping], maxs[overlapping], -self._signs[overlapping])
 
     @classmethod
     def parse_instructions(cls, instructions: list[tuple[bool, Cuboid]]) -> EfficientGrid:
-        """ Parse instructions to create efficient grid with non-overlapping lit cuboids. """
+        """ Parse instructions to create efficient grid with signed cuboids. """
         grid = cls()
         for sign, new_cuboid in instructions:
             if sign:
@@ -194,87 +67,66 @@ class EfficientGrid:
 
     def count_lit(self) -> int:
         """ Total count of lit voxels on the grid. """
-        return sum(len(cuboid) for cuboid in self._lit_cuboids)
+        volumes = (self._maxs - self._mins + 1).prod(axis=1) * self._signs
+        # volumes of big cuboids fit into int64, but their sum might not
+        return sum(volumes.tolist())
 
 
 @dataclass()
 class Grid:
     """
-        Grid with sparse matrix of all lit cubes centered around voxels parsed from lit cuboids.
+        Grid with dense matrix of all cubes within limit on all axis, where lit cubes are set.
     """
-    _lit_cubes: set[Voxel] = field(default_factory=set, init=False)
+    _cubes: np.ndarray = field(
+        default_factory=lambda: np.zeros((LIMIT[1] - LIMIT[0] + 1,) * 3, dtype=np.bool_), init=False
+    )
 
     @classmethod
     def parse_instructions(cls, instructions: list[tuple[bool, Cuboid]]) -> Grid:
         """ Parse instructions to create simple grid storing all lit cubes.  """
         grid = cls()
         for sign, cuboid in instructions:
-            if cuboid:
-                grid.switch_light(sign, cuboid)
+            grid.switch_light(sign, cuboid)
         return grid
 
     def count_lit(self) -> int:
         """ Total count of lit pixels on the grid. """
-        return len(self._lit_cubes)
-
-    def is_lit(self, voxel: Voxel) -> bool:
-        """ If given voxel is lit. """
-        return voxel in self._lit_cubes
+        return int(self._cubes.sum())
 
     def switch_light(self, turn_on: bool, cuboid: Cuboid) -> None:
-        for x in range(cuboid.x.min, cuboid.x.max + 1):
-            for y in range(cuboid.y.min, cuboid.y.max + 1):
-                for z in range(cuboid.z.min, cuboid.z.max + 1):
-                    voxel = Voxel(x, y, z)
-                    if turn_on:
-                        self._lit_cubes.add(voxel)
-                    else:
-                        self._lit_cubes.discard(voxel)
-
-
-def cut_off(cuboid: Cuboid, limit=Range(-50, 50)) -> Cuboid | None:
-    """ Cut off cuboid to fit within given range on all axis. """
-    ranges = []
-    for axis in cuboid:
-        a, b = axis
-        new_a = a
-        new_b = b
-        if a < limit.min:
-            new_a = limit.min
-        if a > limit.max:
-            logging.debug(f'\nThrowing off {cuboid} due to invalid range {a, b}!')
-            return None
-        if b < limit.min:
-            logging.debug(f'\nThrowing off {cuboid} due to invalid range {a, b}!')
-            return None
-        if b > limit.max:
-            new_b = limit.max
-        if a != new_a or b != new_b:
-            logging.debug(f'Cutting off range {a, b} to {new_a, new_b}!')
-        ranges.append(Range(new_a, new_b))
-    return Cuboid(*ranges)
+        x_min, x_max, y_min, y_max, z_min, z_max = (axis - LIMIT[0] for axis in cuboid)
+        self._cubes[x_min:x_max + 1, y_min:y_max + 1, z_min:z_max + 1] = turn_on
+
+
+def cut_off(cuboids: np.ndarray, limit: tuple[int, int] = LIMIT) -> tuple[np.ndarray, np.ndarray]:
+    """
+        Cut off (N, 6) array of cuboids to fit within given range on all axis.
+        Return cut off cuboids and mask of those which have any voxel within range at all.
+    """
+    limit_min, limit_max = limit
+    valid = (cuboids[:, 0::2] <= limit_max).all(axis=1) & (cuboids[:, 1::2] >= limit_min).all(axis=1)
+    return np.clip(cuboids, limit_min, limit_max), valid
 
 
 def parse_file(input_file: str, cutoff: bool) -> list[tuple[bool, Cuboid]]:
     """ Parse given file into Cuboids with signal on or off and optionally cut off by given limit."""
-    lines = []
-
     with open(input_file) as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            signal, rest = line.split()
-            signal = (signal == 'on')
-            match = re.search(REGEX, rest)
-            x_range = Range(int(match.group('x1')), int(match.group('x2')))
-            y_range = Range(int(match.group('y1')), int(match.group('y2')))
-            z_range = Range(int(match.group('z1')), int(match.group('z2')))
-            cuboid = Cuboid(x_range, y_range, z_range)
-            if cutoff:
-                cuboid = cut_off(cuboid)
-            lines.append((signal, cuboid))
-    return lines
+        text = f.read()
+    rows = REGEX.findall(text)
+    lines = [line for line in text.splitlines() if line.strip()]
+    if len(rows) != len(lines):
+        invalid = [line for line in lines if not REGEX.fullmatch(line)]
+        raise ValueError(f'Invalid reboot steps in {input_file}: {invalid}')
+    signals = [signal == 'on' for signal, *_ in rows]
+    cuboids = np.array([bounds for _, *bounds in rows], dtype=np.int64).reshape(-1, 6)
+
+    if not cutoff:
+        return [(signal, tuple(cuboid)) for signal, cuboid in zip(signals, cuboids.tolist())]
+    cut_cuboids, valid = cut_off(cuboids)
+    return [
+        (signal, tuple(cuboid))
+        for signal, cuboid, is_valid in zip(signals, cut_cuboids.tolist(), valid.tolist()) if is_valid
+    ]
 
 
 # part 1
@@ -302,42 +154,32 @@ def test_count_lit_cubes():
     assert test_count == 2758514936282235
 
 
-def test_cuboid_overlap():
-    cuboid_1 = Cuboid(Range(1, 2), Range(1, 2), Range(1, 2))
-    cuboid_2 = Cuboid(Range(2, 3), Range(-1, 1), Range(-1, 3))
-    cuboid_3 = Cuboid(Range(5, 6), Range(-6, -5), Range(0, 0))
-    assert cuboid_1.overlaps(cuboid_1)
-    assert cuboid_1.overlaps(cuboid_2)
-    assert cuboid_2.overlaps(cuboid_1)
-    assert not cuboid_1.overlaps(cuboid_3)
-
-
-def test_cuboid_split():
-    cuboid_1 = Cuboid(Range(1, 3), Range(1, 3), Range(1, 3))
-    cuboid_2 = Cuboid(Range(2, 2), Range(2, 2), Range(1, 3))
-    cuboid_3 = Cuboid(Range(2, 2), Range(2, 2), Range(2, 2))
-    new_cuboids = cuboid_1.extract(cuboid_2)
-    assert len(new_cuboids) == 8
-    assert cuboid_1.get_intersection(cuboid_2) not in new_cuboids
-    new_cuboids = cuboid_1.extract(cuboid_3)
-    assert len(new_cuboids) == 26
-    assert cuboid_1.get_intersection(cuboid_3) not in new_cuboids
-
-
-def test_range_get_intersection():
-    range_1 = Range(0, 5)
-    range_2 = Range(-3, 3)
-    range_3 = Range(6, 8)
-    assert range_1.get_intersection(range_2) == Range(0, 3)
-    assert range_1.get_intersection(range_3) is None
-
-
-def test_cuboid_contains():
-    cuboid_1 = Cuboid(Range(1, 2), Range(1, 2), Range(1, 2))
-    cuboid_2 = Cuboid(Range(0, 3), Range(-1, 2), Range(1, 2))
-    assert cuboid_1 in cuboid_1
-    assert cuboid_1 in cuboid_2
-    assert cuboid_2 not in cuboid_1
+def test_efficient_grid_overlaps():
+    grid = EfficientGrid()
+    grid.add_lit((0, 2, 0, 2, 0, 2))
+    grid.add_lit((1, 3, 1, 3, 1, 3))
+    # both 27 cubes, overlapping in 8 of them
+    assert grid.count_lit() == 46
+    grid.remove_lit((1, 1, 1, 1, 1, 1))
+    assert grid.count_lit() == 45
+    # switching on lit cube again or switching off outside of lit cubes changes nothing
+    grid.add_lit((0, 0, 0, 0, 0, 0))
+    grid.remove_lit((10, 12, 10, 12, 10, 12))
+    assert grid.count_lit() == 45
+
+
+def test_parse_file_trailing_spaces(tmp_path):
+    input_file = tmp_path / 'input.txt'
+    input_file.write_text('on x=1..2,y=1..2,z=1..2   \n\noff x=2..2,y=2..2,z=2..2 \n')
+    instructions = parse_file(str(input_file), cutoff=False)
+    assert instructions == [(True, (1, 2, 1, 2, 1, 2)), (False, (2, 2, 2, 2, 2, 2))]
+
+
+def test_parse_file_invalid_line(tmp_path):
+    input_file = tmp_path / 'input.txt'
+    input_file.write_text('on x=1..2,y=1..2,z=1..2\non x=1..2,y=1..2\n')
+    with pytest.raises(ValueError, match='on x=1..2,y=1..2'):
+        parse_file(str(input_file), cutoff=False)
 
 
 if __name__ == "__main__":